@@ -0,0 +1,40 @@
+# fbr_core/_fallbacks.py
+"""Stand-ins for the FBR API helpers, used when fbr_api_service cannot be imported
+
+Only imported from the dialogs' ``except ImportError`` branches, so the
+normal startup path never loads this module.
+"""
+import requests
+
+
+def get_http_session():
+    return requests.Session()
+
+
+def get_cached_dropdown(dropdown_key): return None
+def store_dropdown(dropdown_key, data): pass
+
+
+class FBRDropdownManager:
+    def __init__(self, db_manager): pass
+    def load_dropdown_data(self, *args, **kwargs): pass
+    def format_data_for_dropdown(self, key, data): return []
+    def cleanup_threads(self): pass
+
+
+class FBRDateUtils:
+    @staticmethod
+    def format_date_for_fbr(date_obj): return date_obj.strftime('%d-%b-%Y')
+    @staticmethod
+    def format_date_iso(date_obj): return date_obj.strftime('%Y-%m-%d')
+
+
+class DropdownDataFormatter:
+    @staticmethod
+    def extract_hs_code_from_dropdown_text(text):
+        try: return text.partition(' - ')[0].strip()
+        except AttributeError: return ""
+    @staticmethod
+    def extract_id_from_dropdown_text(text, position=-1):
+        try: return text.split(' - ')[position].strip()
+        except (IndexError, AttributeError): return ""
@@ -1,7 +1,12 @@
 # fbr_core/fbr_api_service.py
+import os
+import time
 import requests
+from requests.adapters import HTTPAdapter
 import json
-from datetime import datetime
+from datetime import date, datetime
+from functools import lru_cache
+from pathlib import Path
 from typing import Dict, List, Optional, Any
 from PyQt6.QtCore import QObject, pyqtSignal, QThread
 import logging
@@ -10,6 +15,68 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# One pooled HTTP session shared by every FBRAPIService, so dialogs reuse
+# open TLS connections to the gateway instead of handshaking per instance
+_HTTP_SESSION = None
+
+
+def get_http_session() -> requests.Session:
+    """Return the shared, connection-pooled session for FBR API calls"""
+    global _HTTP_SESSION
+    if _HTTP_SESSION is None:
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+        _HTTP_SESSION = session
+    return _HTTP_SESSION
+
+
+# Reference dropdown data (provinces, HS codes, transaction types) changes
+# rarely, so API results are kept on disk and reused across dialogs and app
+# restarts: dropdown_key -> [fetched_at, raw API data]
+_DROPDOWN_CACHE_FILE = Path.home() / ".cache" / "fbr_einvoicing" / "dropdowns.json"
+_DAY = 24 * 3600  # seconds
+_DROPDOWN_CACHE_TTLS = {
+    'provinces': 30 * _DAY,
+    'hs_codes': 7 * _DAY,
+}
+_DEFAULT_DROPDOWN_CACHE_TTL = _DAY
+_DROPDOWN_CACHE = None
+
+
+def _dropdown_cache():
+    """Return the dropdown cache, reading it from disk on first use"""
+    global _DROPDOWN_CACHE
+    if _DROPDOWN_CACHE is None:
+        try:
+            with open(_DROPDOWN_CACHE_FILE, "r", encoding="utf-8") as f:
+                _DROPDOWN_CACHE = json.load(f)
+        except (OSError, ValueError):
+            _DROPDOWN_CACHE = {}
+    return _DROPDOWN_CACHE
+
+
+def get_cached_dropdown(dropdown_key: str) -> Optional[List[Dict]]:
+    """Return cached raw data for a dropdown, or None if missing or stale"""
+    entry = _dropdown_cache().get(dropdown_key)
+    ttl = _DROPDOWN_CACHE_TTLS.get(dropdown_key, _DEFAULT_DROPDOWN_CACHE_TTL)
+    if entry and time.time() - entry[0] < ttl:
+        return entry[1]
+    return None
+
+
+def store_dropdown(dropdown_key: str, data: List[Dict]):
+    """Cache raw dropdown data and rewrite the cache file atomically"""
+    cache = _dropdown_cache()
+    cache[dropdown_key] = [time.time(), data]
+    try:
+        _DROPDOWN_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = _DROPDOWN_CACHE_FILE.with_suffix(".tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp_file, _DROPDOWN_CACHE_FILE)
+    except OSError as e:
+        logger.warning(f"Could not write dropdown cache: {e}")
+
 
 class FBRAPIService(QObject):
     """Service class for FBR API interactions"""
@@ -22,11 +89,13 @@ class FBRAPIService(QObject):
         super().__init__()
         self.db_manager = db_manager
         self.base_url = "https://gw.fbr.gov.pk"
-        self.session = requests.Session()
+        self.session = get_http_session()
+        # Kept per service (not on the shared session) as the token is per company
+        self.headers = {}
         self._setup_session()
         
     def _setup_session(self):
-        """Setup session with default headers and authorization"""
+        """Setup default headers and authorization for this service"""
         try:
             if self.db_manager:
                 session_db = self.db_manager.get_session()
@@ -34,7 +103,7 @@ class FBRAPIService(QObject):
                 
                 settings = session_db.query(FBRSettings).first()
                 if settings and settings.pral_authorization_token:
-                    self.session.headers.update({
+                    self.headers.update({
                         'Authorization': f'Bearer {settings.pral_authorization_token}',
                         'Content-Type': 'application/json',
                         'Accept': 'application/json'
@@ -55,7 +124,7 @@ class FBRAPIService(QObject):
             if params:
                 logger.info(f"With parameters: {params}")
                 
-            response = self.session.get(url, params=params, timeout=30)
+            response = self.session.get(url, params=params, headers=self.headers, timeout=30)
             response.raise_for_status()
             
             data = response.json()
@@ -165,6 +234,7 @@ class FBRAPIThread(QThread):
     """Background thread for FBR API calls"""
     
     data_received = pyqtSignal(str, list)  # endpoint_key, data
+    data_formatted = pyqtSignal(str, list, list)  # endpoint_key, data, formatted items
     error_occurred = pyqtSignal(str, str)  # endpoint_key, error_message
     
     def __init__(self, api_service: FBRAPIService, endpoint_key: str, method_name: str, **kwargs):
@@ -173,6 +243,8 @@ class FBRAPIThread(QThread):
         self.endpoint_key = endpoint_key
         self.method_name = method_name
         self.kwargs = kwargs
+        # Optional data -> display items function, run on this thread
+        self.formatter = None
     
     def run(self):
         """Execute the API call in background thread"""
@@ -182,6 +254,8 @@ class FBRAPIThread(QThread):
             
             if data is not None:
                 self.data_received.emit(self.endpoint_key, data)
+                if self.formatter:
+                    self.data_formatted.emit(self.endpoint_key, data, self.formatter(data))
             else:
                 self.error_occurred.emit(self.endpoint_key, f"Failed to fetch {self.endpoint_key}")
                 
@@ -241,6 +315,11 @@ class DropdownDataFormatter:
             position: Position of ID in split (-1 for last, 0 for first, etc.)
         """
         try:
+            # First and last parts need no intermediate list
+            if position == -1:
+                return text.rpartition(' - ')[2].strip()
+            if position == 0:
+                return text.partition(' - ')[0].strip()
             parts = text.split(' - ')
             return parts[position].strip()
         except (IndexError, AttributeError):
@@ -250,8 +329,8 @@ class DropdownDataFormatter:
     def extract_hs_code_from_dropdown_text(text: str) -> str:
         """Extract HS code from formatted dropdown text"""
         try:
-            return text.split(' - ')[0].strip()
-        except (IndexError, AttributeError):
+            return text.partition(' - ')[0].strip()
+        except AttributeError:
             return ""
 
 
@@ -265,12 +344,14 @@ class FBRDropdownManager:
         self.cached_data = {}
         self.loading_threads = {}
     
-    def load_dropdown_data(self, dropdown_key: str, callback=None, **params):
+    def load_dropdown_data(self, dropdown_key: str, callback=None, formatted_callback=None, **params):
         """Load dropdown data asynchronously
         
         Args:
             dropdown_key: Key identifying the dropdown type
             callback: Function to call when data is loaded
+            formatted_callback: Function called with (key, data, formatted items);
+                the formatting runs on the background thread
             **params: Additional parameters for API call
         """
         
@@ -301,6 +382,12 @@ class FBRDropdownManager:
         
         if callback:
             thread.data_received.connect(lambda key, data: callback(key, data))
+        if formatted_callback:
+            thread.formatter = lambda data: self.format_data_for_dropdown(dropdown_key, data)
+            thread.data_formatted.connect(
+                lambda key, data, items: formatted_callback(key, data, items)
+            )
+        if callback or formatted_callback:
             thread.error_occurred.connect(lambda key, error: logger.error(f"Error loading {key}: {error}"))
         
         self.loading_threads[dropdown_key] = thread
@@ -338,6 +425,19 @@ class FBRDropdownManager:
 
 
 # Date formatting utilities for FBR APIs
+def _date_key(date_obj) -> tuple:
+    """(year, month, day) of a QDate, date or datetime"""
+    if callable(date_obj.year):  # QDate
+        return date_obj.year(), date_obj.month(), date_obj.day()
+    return date_obj.year, date_obj.month, date_obj.day
+
+
+# Cascading lookups format the same invoice date over and over
+@lru_cache(maxsize=32)
+def _format_date(date_key: tuple, fmt: str) -> str:
+    return date(*date_key).strftime(fmt)
+
+
 class FBRDateUtils:
     """Utility class for FBR date formatting"""
     
@@ -352,10 +452,7 @@ class FBRDateUtils:
             Formatted date string like '04-Feb-2024'
         """
         try:
-            if hasattr(date_obj, 'toPython'):  # QDate
-                date_obj = date_obj.toPython()
-            
-            return date_obj.strftime('%d-%b-%Y')
+            return _format_date(_date_key(date_obj), '%d-%b-%Y')
             
         except Exception as e:
             logger.error(f"Error formatting date: {e}")
@@ -372,10 +469,7 @@ class FBRDateUtils:
             Formatted date string like '2024-02-04'
         """
         try:
-            if hasattr(date_obj, 'toPython'):  # QDate
-                date_obj = date_obj.toPython()
-            
-            return date_obj.strftime('%Y-%m-%d')
+            return _format_date(_date_key(date_obj), '%Y-%m-%d')
             
         except Exception as e:
             logger.error(f"Error formatting date: {e}")
@@ -14,6 +14,7 @@ from sqlalchemy import (
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from datetime import datetime, timedelta
+from contextlib import contextmanager
 
 Base = declarative_base()
 
@@ -72,6 +73,8 @@ class Buyer(Base):
     # Indexes
     __table_args__ = (
         Index('ix_buyers_company_ntn', 'company_id', 'ntn_cnic'),
+        Index('ix_buyers_company_name', 'company_id', 'name'),
+        Index('ix_buyers_company_active', 'company_id', 'is_active'),
     )
 
 
@@ -166,6 +169,7 @@ class Invoices(Base):
         Index('ix_invoices_company_date', 'company_id', 'posting_date'),
         Index('ix_invoices_fbr_status', 'company_id', 'fbr_status'),
         Index('ix_invoices_number', 'company_id', 'invoice_number'),
+        Index('ix_invoices_buyer', 'buyer_id'),
     )
 
 
@@ -403,13 +407,34 @@ class DatabaseManager:
         Base.metadata.create_all(self.engine)
         
         # Create session
-        Session = sessionmaker(bind=self.engine)
-        self.session = Session()
+        self.Session = sessionmaker(bind=self.engine)
+        self.session = self.Session()
 
     def get_session(self):
         """Get database session"""
         return self.session
 
+    def create_session(self):
+        """Create a new independent session (e.g. for a worker thread)"""
+        return self.Session()
+
+    @contextmanager
+    def session_scope(self):
+        """Provide a short-lived session that commits on success
+
+        Rolls back on error and always closes, returning the connection to
+        the pool. Objects stay readable after the scope ends.
+        """
+        session = self.Session(expire_on_commit=False)
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
     def close(self):
         """Close database connection"""
         self.session.close()
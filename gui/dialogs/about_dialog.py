@@ -1,17 +1,92 @@
 # gui/dialogs/about_dialog.py
+import os
 import sys
+import platform
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QTextEdit, QFrame, QApplication
 )
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QFont, QPixmap
+from PyQt6.QtGui import QFont, QPixmap, QTextCursor, QTextDocumentFragment
 from pathlib import Path
 
+try:
+    from PyQt6.QtCore import QT_VERSION_STR, PYQT_VERSION_STR
+except ImportError:
+    QT_VERSION_STR = "Unknown"
+    PYQT_VERSION_STR = "Unknown"
+
+# System information does not change while the process runs, so look it up once
+_PLATFORM_SYSTEM = platform.system()
+_PLATFORM_RELEASE = platform.release()
+_PLATFORM_MACHINE = platform.machine()
+_PYTHON_VERSION = platform.python_version()
+
+# Candidate logo locations, resolved to absolute paths once at import
+_LOGO_CANDIDATES: tuple = tuple(dict.fromkeys(
+    os.path.abspath(path) for path in (
+        "resources/icons/fbr.jpg",
+        "resources/icons/fbr.png",
+        "gui/dialogs/../../../resources/icons/fbr.jpg",
+        str(Path(__file__).parent.parent.parent / "resources" / "icons" / "fbr.jpg"),
+    )
+))
+
+_INFO_HTML = """
+<h3 style="color: #5aa2ff;">About This Application</h3>
+
+<p><strong>FBR E-Invoicing System</strong> is a comprehensive desktop application designed to help Pakistani businesses comply with Federal Board of Revenue (FBR) electronic invoicing requirements.</p>
+
+<h4 style="color: #ffc107;">Key Features:</h4>
+<ul>
+<li>📄 <strong>Invoice Management:</strong> Create, edit, and manage sales invoices</li>
+<li>🏢 <strong>Multi-Company Support:</strong> Handle multiple companies from single application</li>
+<li>📦 <strong>Item Management:</strong> Manage products and services with FBR HS codes</li>
+<li>🔄 <strong>FBR Integration:</strong> Direct integration with FBR APIs for real-time validation</li>
+<li>⚡ <strong>Queue System:</strong> Automatic retry mechanism for failed submissions</li>
+<li>📊 <strong>Comprehensive Logging:</strong> Detailed logs of all FBR transactions</li>
+<li>🔒 <strong>Secure:</strong> Encrypted storage of sensitive data</li>
+<li>🎯 <strong>Sandbox Testing:</strong> Test your invoices before production submission</li>
+</ul>
+
+<h4 style="color: #ffc107;">Technology Stack:</h4>
+<ul>
+<li><strong>Framework:</strong> PyQt6 for modern desktop UI</li>
+<li><strong>Database:</strong> PostgreSQL with SQLAlchemy ORM</li>
+<li><strong>Cloud Database:</strong> Neon PostgreSQL for reliable hosting</li>
+<li><strong>APIs:</strong> Direct integration with FBR PRAL APIs</li>
+</ul>
+
+<h4 style="color: #ffc107;">Compliance:</h4>
+<p>This application is designed to comply with FBR's electronic invoicing requirements as per the latest regulations. It supports both sandbox testing and production environments.</p>
+
+<h4 style="color: #28a745;">Support:</h4>
+<p>For technical support, documentation, or feature requests, please contact your system administrator.</p>
+
+<hr>
+<p style="text-align: center; color: #888888; font-size: 12px;">
+© 2024 FBR E-Invoicing System. Built with ❤️ for Pakistani businesses.
+</p>
+"""
+
+_SYSTEM_INFO_HTML = f"""
+<table style="color: #cccccc; font-size: 12px;">
+<tr><td><strong>Platform:</strong></td><td>{_PLATFORM_SYSTEM} {_PLATFORM_RELEASE}</td></tr>
+<tr><td><strong>Python:</strong></td><td>{_PYTHON_VERSION}</td></tr>
+<tr><td><strong>PyQt6:</strong></td><td>{PYQT_VERSION_STR}</td></tr>
+<tr><td><strong>Qt:</strong></td><td>{QT_VERSION_STR}</td></tr>
+<tr><td><strong>Architecture:</strong></td><td>{_PLATFORM_MACHINE}</td></tr>
+</table>
+"""
+
 
 class AboutDialog(QDialog):
     """About dialog for FBR E-Invoicing System"""
     
+    # Shared Qt objects, built on first open (they need a QApplication)
+    _INFO_FRAGMENT = None
+    _TITLE_FONT = None
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         
@@ -72,24 +147,12 @@ class AboutDialog(QDialog):
         logo_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         # Look for FBR logo in various locations
-        logo_paths = [
-            Path("resources/icons/fbr.jpg"),
-            Path("resources/icons/fbr.png"),
-            Path("gui/dialogs/../../../resources/icons/fbr.jpg"),
-            Path(__file__).parent.parent.parent / "resources" / "icons" / "fbr.jpg"
-        ]
-        
         logo_found = False
-        for logo_path in logo_paths:
-            if logo_path.exists():
-                pixmap = QPixmap(str(logo_path))
+        for logo_path in _LOGO_CANDIDATES:
+            if os.path.isfile(logo_path):
+                pixmap = QPixmap(logo_path)
                 if not pixmap.isNull():
-                    scaled_pixmap = pixmap.scaled(
-                        200, 80, 
-                        Qt.AspectRatioMode.KeepAspectRatio, 
-                        Qt.TransformationMode.SmoothTransformation
-                    )
-                    logo_label.setPixmap(scaled_pixmap)
+                    logo_label.setPixmap(self._fit_logo(pixmap))
                     logo_found = True
                     break
         
@@ -101,10 +164,7 @@ class AboutDialog(QDialog):
         
         # Application title
         title_label = QLabel("FBR E-Invoicing System")
-        title_font = QFont()
-        title_font.setPointSize(20)
-        title_font.setBold(True)
-        title_label.setFont(title_font)
+        title_label.setFont(self._title_font())
         title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         title_label.setStyleSheet("color: #5aa2ff; margin: 10px 0;")
         header_layout.addWidget(title_label)
@@ -122,44 +182,8 @@ class AboutDialog(QDialog):
         info_text.setReadOnly(True)
         info_text.setMaximumHeight(350)
         
-        info_content = """
-<h3 style="color: #5aa2ff;">About This Application</h3>
-
-<p><strong>FBR E-Invoicing System</strong> is a comprehensive desktop application designed to help Pakistani businesses comply with Federal Board of Revenue (FBR) electronic invoicing requirements.</p>
-
-<h4 style="color: #ffc107;">Key Features:</h4>
-<ul>
-<li>📄 <strong>Invoice Management:</strong> Create, edit, and manage sales invoices</li>
-<li>🏢 <strong>Multi-Company Support:</strong> Handle multiple companies from single application</li>
-<li>📦 <strong>Item Management:</strong> Manage products and services with FBR HS codes</li>
-<li>🔄 <strong>FBR Integration:</strong> Direct integration with FBR APIs for real-time validation</li>
-<li>⚡ <strong>Queue System:</strong> Automatic retry mechanism for failed submissions</li>
-<li>📊 <strong>Comprehensive Logging:</strong> Detailed logs of all FBR transactions</li>
-<li>🔒 <strong>Secure:</strong> Encrypted storage of sensitive data</li>
-<li>🎯 <strong>Sandbox Testing:</strong> Test your invoices before production submission</li>
-</ul>
-
-<h4 style="color: #ffc107;">Technology Stack:</h4>
-<ul>
-<li><strong>Framework:</strong> PyQt6 for modern desktop UI</li>
-<li><strong>Database:</strong> PostgreSQL with SQLAlchemy ORM</li>
-<li><strong>Cloud Database:</strong> Neon PostgreSQL for reliable hosting</li>
-<li><strong>APIs:</strong> Direct integration with FBR PRAL APIs</li>
-</ul>
-
-<h4 style="color: #ffc107;">Compliance:</h4>
-<p>This application is designed to comply with FBR's electronic invoicing requirements as per the latest regulations. It supports both sandbox testing and production environments.</p>
-
-<h4 style="color: #28a745;">Support:</h4>
-<p>For technical support, documentation, or feature requests, please contact your system administrator.</p>
-
-<hr>
-<p style="text-align: center; color: #888888; font-size: 12px;">
-© 2024 FBR E-Invoicing System. Built with ❤️ for Pakistani businesses.
-</p>
-        """
-        
-        info_text.setHtml(info_content)
+        info_text.textCursor().insertFragment(self._info_fragment())
+        info_text.moveCursor(QTextCursor.MoveOperation.Start)
         layout.addWidget(info_text)
         
         # System info
@@ -180,27 +204,7 @@ class AboutDialog(QDialog):
         system_label.setStyleSheet("font-weight: bold; color: #5aa2ff; font-size: 14px;")
         system_layout.addWidget(system_label)
         
-        # Get system info
-        import platform
-        try:
-            from PyQt6.QtCore import QT_VERSION_STR, PYQT_VERSION_STR
-            qt_version = QT_VERSION_STR
-            pyqt_version = PYQT_VERSION_STR
-        except ImportError:
-            qt_version = "Unknown"
-            pyqt_version = "Unknown"
-        
-        system_info = f"""
-<table style="color: #cccccc; font-size: 12px;">
-<tr><td><strong>Platform:</strong></td><td>{platform.system()} {platform.release()}</td></tr>
-<tr><td><strong>Python:</strong></td><td>{platform.python_version()}</td></tr>
-<tr><td><strong>PyQt6:</strong></td><td>{pyqt_version}</td></tr>
-<tr><td><strong>Qt:</strong></td><td>{qt_version}</td></tr>
-<tr><td><strong>Architecture:</strong></td><td>{platform.machine()}</td></tr>
-</table>
-        """
-        
-        system_info_label = QLabel(system_info)
+        system_info_label = QLabel(_SYSTEM_INFO_HTML)
         system_info_label.setStyleSheet("color: #cccccc; font-size: 12px;")
         system_layout.addWidget(system_info_label)
         
@@ -216,6 +220,42 @@ class AboutDialog(QDialog):
         
         layout.addLayout(button_layout)
 
+    @classmethod
+    def _info_fragment(cls):
+        """Return the parsed about text, parsing the HTML only once"""
+        if cls._INFO_FRAGMENT is None:
+            cls._INFO_FRAGMENT = QTextDocumentFragment.fromHtml(_INFO_HTML)
+        return cls._INFO_FRAGMENT
+
+    @classmethod
+    def _title_font(cls):
+        """Return the shared title font"""
+        if cls._TITLE_FONT is None:
+            font = QFont()
+            font.setPointSize(20)
+            font.setBold(True)
+            cls._TITLE_FONT = font
+        return cls._TITLE_FONT
+
+    @staticmethod
+    def _fit_logo(pixmap, max_width=200, max_height=80):
+        """Fit the logo into the header box, resampling only when needed"""
+        width, height = pixmap.width(), pixmap.height()
+        if width <= max_width and height <= max_height:
+            return pixmap
+        
+        # Nearest-neighbour is indistinguishable from bilinear for mild shrinks
+        if width <= max_width * 2 and height <= max_height * 2:
+            mode = Qt.TransformationMode.FastTransformation
+        else:
+            mode = Qt.TransformationMode.SmoothTransformation
+        
+        return pixmap.scaled(
+            max_width, max_height,
+            Qt.AspectRatioMode.KeepAspectRatio,
+            mode
+        )
+
 
 # Test the dialog
 if __name__ == "__main__":
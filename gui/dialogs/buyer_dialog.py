@@ -1,24 +1,426 @@
 # gui/dialogs/buyer_dialog.py
+import re
 import sys
+import time
 from datetime import datetime
+from enum import IntEnum
+from types import SimpleNamespace
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QGridLayout, QFormLayout,
-    QLabel, QLineEdit, QComboBox, QTextEdit, QPushButton, QTableWidget,
-    QTableWidgetItem, QGroupBox, QMessageBox, QDialogButtonBox,
-    QHeaderView, QFrame, QApplication, QCheckBox
+    QLabel, QLineEdit, QComboBox, QTextEdit, QPushButton, QTableView,
+    QGroupBox, QMessageBox, QDialogButtonBox, QHeaderView, QFrame,
+    QApplication, QCheckBox
 )
-from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QFont
+from PyQt6.QtCore import (
+    Qt, pyqtSignal, QAbstractTableModel, QModelIndex, QSortFilterProxyModel, QTimer,
+    QStringListModel, QSignalBlocker
+)
+from PyQt6.QtGui import QFont, QColor
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import load_only
+from sqlalchemy.orm.attributes import set_committed_value
 
 from fbr_core.models import Buyer
+from gui.workers import DBWorker
+
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_NTN_RE = re.compile(r'^\d{13}$')
+
+# Fixed combo box choices
+_PROVINCES = (
+    "", "Punjab", "Sindh", "Khyber Pakhtunkhwa", "Balochistan",
+    "Gilgit-Baltistan", "Azad Kashmir", "Islamabad Capital Territory"
+)
+_BUYER_TYPES = ("Registered", "Unregistered")
+_TYPE_FILTERS = ("All",) + _BUYER_TYPES
+_STATUS_FILTERS = ("Active Only", "All", "Inactive Only")
+
+
+class StatusFilter(IntEnum):
+    """Status filter choices, numbered as listed in _STATUS_FILTERS"""
+    ACTIVE = 0
+    ALL = 1
+    INACTIVE = 2
+
+# Search box debounce; Enter filters immediately
+_FILTER_DELAY_MS = 300
+
+# One read-only QStringListModel per choice list, shared by every combo box
+_CHOICE_MODELS = {}
+
+
+def _choice_model(choices):
+    """Return the shared list model for a tuple of combo box choices"""
+    model = _CHOICE_MODELS.get(choices)
+    if model is None:
+        model = _CHOICE_MODELS[choices] = QStringListModel(list(choices))
+    return model
+
+
+# Status cell backgrounds, shared by every row
+_ACTIVE_BG = QColor(0x28, 0xa7, 0x45)
+_INACTIVE_BG = QColor(0xdc, 0x35, 0x45)
+
+# Buyer listing per company: company_id -> (loaded_at, rows, ntn_set). Entries
+# are dropped when this module writes buyers and expire after the TTL so
+# buyers created elsewhere (e.g. from an invoice) still show up.
+_BUYERS_CACHE = {}
+_BUYERS_CACHE_TTL = 300  # seconds
+
+# Shared by both buyer dialogs; kept as one constant so it is built only once
+_DIALOG_STYLE = """
+QDialog { 
+    background-color: #0f1115; 
+    color: #eaeef6;
+}
+QLabel { 
+    color: #eaeef6; 
+    font-size: 13px; 
+}
+QGroupBox {
+    background: #1b2028;
+    border: 1px solid #2c3b52;
+    border-radius: 10px;
+    padding: 28px 12px 12px 12px;
+    font-weight: bold;
+}
+QGroupBox::title {
+    subcontrol-origin: margin;
+    subcontrol-position: top left;
+    left: 12px;
+    top: 0px;
+    background: #2c3b52;
+    color: #eaeef6;
+    border-radius: 8px;
+    padding: 2px 10px;
+    font-weight: 600;
+}
+QComboBox, QLineEdit, QTextEdit {
+    background: #0f141c;
+    color: #eaeef6;
+    border: 1px solid #334561;
+    border-radius: 6px;
+    padding: 8px 12px;
+    min-height: 28px;
+}
+QComboBox:focus, QLineEdit:focus, QTextEdit:focus {
+    border: 1px solid #5aa2ff;
+}
+QPushButton {
+    background-color: #5aa2ff; 
+    color: #0f1115; 
+    border: none;
+    padding: 10px 20px; 
+    border-radius: 6px; 
+    font-weight: 700;
+    font-size: 14px;
+}
+QPushButton:hover { background:#7bb6ff; }
+QPushButton:pressed { background:#4b92ec; }
+QPushButton:disabled { background:#333; color:#666; }
+QPushButton[style="success"] { background-color: #28a745; }
+QPushButton[style="success"]:hover { background-color: #218838; }
+QPushButton[style="warning"] { background-color: #ffc107; color: #000; }
+QPushButton[style="warning"]:hover { background-color: #e0a800; }
+QPushButton[style="danger"] { background-color: #dc3545; }
+QPushButton[style="danger"]:hover { background-color: #c82333; }
+QTableView { 
+    background: #0f141c; 
+    color:#eaeef6; 
+    border: 1px solid #334561; 
+}
+QHeaderView::section {
+    background: #17202b; 
+    color: #cfe2ff; 
+    border: 1px solid #334561; 
+    padding: 6px; 
+    font-weight: 600;
+}
+QCheckBox {
+    color: #eaeef6;
+    font-size: 13px;
+}
+QCheckBox::indicator {
+    width: 18px;
+    height: 18px;
+}
+QCheckBox::indicator:unchecked {
+    background: #0f141c;
+    border: 2px solid #334561;
+    border-radius: 4px;
+}
+QCheckBox::indicator:checked {
+    background: #28a745;
+    border: 2px solid #28a745;
+    border-radius: 4px;
+}
+"""
+
+
+class BuyerTableModel(QAbstractTableModel):
+    """Table model exposing a list of buyers to a QTableView
+    
+    Only the rows the view actually paints are formatted, so the cost of a
+    repaint no longer depends on how many buyers the company has.
+    """
+    
+    # Fixed column widths in pixels; the Name column stretches instead
+    COLUMN_WIDTHS = {
+        "id": 60,
+        "ntn_cnic": 120,
+        "buyer_type": 100,
+        "province": 140,
+        "phone": 130,
+        "is_active": 80,
+        "created_at": 100,
+    }
+    
+    ROW_HEIGHT = 30
+    
+    # Rows per query when the owner pages buyers in through fetchMore
+    PAGE_SIZE = 200
+    
+    # Raw, comparable cell values for sorting (e.g. IDs as numbers)
+    SORT_ROLE = Qt.ItemDataRole.UserRole + 1
+    
+    # (header, Buyer attribute) for each column
+    COLUMNS = (
+        ("ID", "id"),
+        ("Name", "name"),
+        ("NTN/CNIC", "ntn_cnic"),
+        ("Type", "buyer_type"),
+        ("Province", "province"),
+        ("Phone", "phone"),
+        ("Status", "is_active"),
+        ("Created", "created_at"),
+    )
+    
+    def __init__(self, columns=None, highlight_status=True, parent=None):
+        super().__init__(parent)
+        self._columns = columns or self.COLUMNS
+        self._highlight_status = highlight_status
+        self._rows = []
+        self._search_keys = []
+        self._fetch_page = None
+
+    @staticmethod
+    def make_search_key(buyer):
+        """Lowercased text the search box is matched against"""
+        return (
+            f"{buyer.name or ''}\x1f{buyer.ntn_cnic or ''}\x1f"
+            f"{buyer.province or ''}\x1f{buyer.buyer_type or ''}"
+        ).lower()
+
+    def set_buyers(self, buyers, fetch_page=None):
+        """Replace the displayed buyers
+        
+        If given, fetch_page(last_buyer) returns the next PAGE_SIZE buyers
+        and is called through fetchMore as the view scrolls to the end. It
+        is dropped once a page comes back short.
+        """
+        self.beginResetModel()
+        # One pass builds both the rows and their search keys
+        self._rows = []
+        self._search_keys = []
+        for buyer in buyers:
+            self._rows.append(buyer)
+            self._search_keys.append(self.make_search_key(buyer))
+        self._fetch_page = fetch_page if len(self._rows) >= self.PAGE_SIZE else None
+        self.endResetModel()
+
+    def append_buyers(self, buyers):
+        """Add buyers after the existing rows"""
+        if not buyers:
+            return
+        
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(buyers) - 1)
+        self._rows.extend(buyers)
+        self._search_keys.extend(self.make_search_key(buyer) for buyer in buyers)
+        self.endInsertRows()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._fetch_page is not None
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._fetch_page is None:
+            return
+        
+        page = self._fetch_page(self._rows[-1])
+        if len(page) < self.PAGE_SIZE:
+            self._fetch_page = None
+        self.append_buyers(page)
+
+    def apply_column_widths(self, view):
+        """Give the view fixed section sizes so it never measures cell contents
+        
+        With uniform row heights the view only asks for data of the rows in
+        the viewport, however many buyers the company has.
+        """
+        header = view.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        for column, (_, field) in enumerate(self._columns):
+            if field == "name":
+                header.setSectionResizeMode(column, QHeaderView.ResizeMode.Stretch)
+            else:
+                header.resizeSection(column, self.COLUMN_WIDTHS[field])
+        
+        rows = view.verticalHeader()
+        rows.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        rows.setDefaultSectionSize(self.ROW_HEIGHT)
+
+    def update_buyer(self, buyer_id, **changes):
+        """Apply field changes to one buyer and repaint only the affected cells
+        
+        Listing rows are immutable query rows, so the row is replaced by a
+        plain copy carrying the new values. Returns False if the buyer is not
+        in the model.
+        """
+        row = next(
+            (i for i, buyer in enumerate(self._rows) if buyer.id == buyer_id), None
+        )
+        if row is None:
+            return False
+        
+        buyer = self._rows[row]
+        values = buyer._asdict() if hasattr(buyer, "_asdict") else dict(vars(buyer))
+        values.update(changes)
+        self._rows[row] = SimpleNamespace(**values)
+        self._search_keys[row] = self.make_search_key(self._rows[row])
+        
+        for column, (_, field) in enumerate(self._columns):
+            if field in changes:
+                index = self.index(row, column)
+                self.dataChanged.emit(
+                    index, index,
+                    [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.BackgroundRole]
+                )
+        return True
+
+    def buyer_at(self, row):
+        """Return the buyer shown on the given row"""
+        return self._rows[row]
+
+    def search_key(self, row):
+        """Return the precomputed search key for the given row"""
+        return self._search_keys[row]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self._columns[section][0]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        
+        buyer = self._rows[index.row()]
+        field = self._columns[index.column()][1]
+        
+        if role == Qt.ItemDataRole.DisplayRole:
+            value = getattr(buyer, field)
+            if field == "id":
+                return str(value)
+            if field == "is_active":
+                return "Active" if value else "Inactive"
+            if field == "created_at":
+                return value.strftime("%Y-%m-%d") if value else ""
+            return value or ""
+        
+        if role == Qt.ItemDataRole.UserRole:
+            return buyer.id
+        
+        if role == self.SORT_ROLE:
+            value = getattr(buyer, field)
+            if field == "is_active":
+                return int(bool(value))
+            if field == "created_at":
+                return value.isoformat() if value else ""
+            return "" if value is None else value
+        
+        if role == Qt.ItemDataRole.BackgroundRole and field == "is_active" and self._highlight_status:
+            return _ACTIVE_BG if buyer.is_active else _INACTIVE_BG
+        
+        return None
+
+
+class BuyerFilterProxyModel(QSortFilterProxyModel):
+    """Filters and sorts a BuyerTableModel by search text, buyer type and status
+    
+    Filtering and sorting only remap row indices; the source rows are never
+    rebuilt.
+    """
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSortRole(BuyerTableModel.SORT_ROLE)
+        self.setSortCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        
+        self._search_text = ""
+        self._buyer_type = "All"
+        self._status = StatusFilter.ALL
+        
+        # Derived once per criteria change for filterAcceptsRow
+        self._filtering = False
+        self._want_active = None
+
+    def set_filters(self, search_text="", buyer_type="All", status=StatusFilter.ALL):
+        """Update the filter criteria and re-filter once
+        
+        Nothing is re-filtered when the criteria are unchanged, e.g. when a
+        debounced burst of keystrokes ends on the text it started from.
+        """
+        search_text = search_text.strip().lower()
+        if (search_text, buyer_type, status) == (self._search_text, self._buyer_type, self._status):
+            return
+        
+        self._search_text = search_text
+        self._buyer_type = buyer_type
+        self._status = status
+        self._filtering = bool(search_text) or buyer_type != "All" or status != StatusFilter.ALL
+        self._want_active = None if status == StatusFilter.ALL else status == StatusFilter.ACTIVE
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        # Fast path: nothing to filter on
+        if not self._filtering:
+            return True
+        
+        model = self.sourceModel()
+        
+        # Search filter
+        if self._search_text and self._search_text not in model.search_key(source_row):
+            return False
+        
+        buyer = model.buyer_at(source_row)
+        
+        # Type filter
+        if self._buyer_type != "All" and buyer.buyer_type != self._buyer_type:
+            return False
+        
+        # Status filter
+        if self._want_active is not None and bool(buyer.is_active) != self._want_active:
+            return False
+        
+        return True
 
 
 class BuyerManagementDialog(QDialog):
     """Dialog for managing company-specific buyers/customers"""
     
+    # Shared header font, built on first use (needs a QApplication)
+    _HEADER_FONT = None
+    
     def __init__(self, db_manager, company_data, parent=None):
         super().__init__(parent)
         self.db_manager = db_manager
+        self._session = db_manager.get_session()
         self.company_data = company_data
         self.company_id = company_data['ntn_cnic']
         
@@ -26,94 +428,21 @@ class BuyerManagementDialog(QDialog):
         self.setModal(True)
         self.resize(1000, 700)
         
-        self.setStyleSheet("""
-            QDialog { 
-                background-color: #0f1115; 
-                color: #eaeef6;
-            }
-            QLabel { 
-                color: #eaeef6; 
-                font-size: 13px; 
-            }
-            QGroupBox {
-                background: #1b2028;
-                border: 1px solid #2c3b52;
-                border-radius: 10px;
-                padding: 28px 12px 12px 12px;
-                font-weight: bold;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                subcontrol-position: top left;
-                left: 12px;
-                top: 0px;
-                background: #2c3b52;
-                color: #eaeef6;
-                border-radius: 8px;
-                padding: 2px 10px;
-                font-weight: 600;
-            }
-            QComboBox, QLineEdit, QTextEdit {
-                background: #0f141c;
-                color: #eaeef6;
-                border: 1px solid #334561;
-                border-radius: 6px;
-                padding: 8px 12px;
-                min-height: 28px;
-            }
-            QComboBox:focus, QLineEdit:focus, QTextEdit:focus {
-                border: 1px solid #5aa2ff;
-                box-shadow: 0 0 0 2px rgba(90,162,255,0.18);
-            }
-            QPushButton {
-                background-color: #5aa2ff; 
-                color: #0f1115; 
-                border: none;
-                padding: 10px 20px; 
-                border-radius: 6px; 
-                font-weight: 700;
-                font-size: 14px;
-            }
-            QPushButton:hover { background:#7bb6ff; }
-            QPushButton:pressed { background:#4b92ec; }
-            QPushButton:disabled { background:#333; color:#666; }
-            QPushButton[style="success"] { background-color: #28a745; }
-            QPushButton[style="success"]:hover { background-color: #218838; }
-            QPushButton[style="warning"] { background-color: #ffc107; color: #000; }
-            QPushButton[style="warning"]:hover { background-color: #e0a800; }
-            QPushButton[style="danger"] { background-color: #dc3545; }
-            QPushButton[style="danger"]:hover { background-color: #c82333; }
-            QTableWidget { 
-                background: #0f141c; 
-                color:#eaeef6; 
-                border: 1px solid #334561; 
-            }
-            QHeaderView::section {
-                background: #17202b; 
-                color: #cfe2ff; 
-                border: 1px solid #334561; 
-                padding: 6px; 
-                font-weight: 600;
-            }
-            QCheckBox {
-                color: #eaeef6;
-                font-size: 13px;
-            }
-            QCheckBox::indicator {
-                width: 18px;
-                height: 18px;
-            }
-            QCheckBox::indicator:unchecked {
-                background: #0f141c;
-                border: 2px solid #334561;
-                border-radius: 4px;
-            }
-            QCheckBox::indicator:checked {
-                background: #28a745;
-                border: 2px solid #28a745;
-                border-radius: 4px;
-            }
-        """)
+        self.setObjectName("BuyerManagementDialog")
+        self.setStyleSheet(_DIALOG_STYLE)
+        
+        # Background DB writes still in flight
+        self._workers = set()
+        
+        # NTN/CNICs of the loaded buyers, for the duplicate check on save
+        self._ntn_set = set()
+        
+        # What changed while the dialog was open, for the opener to apply
+        self.created_buyers = []
+        self.buyers_changed = False
+        
+        # Identifies the newest listing query; older results are dropped
+        self._load_token = None
         
         self.setup_ui()
         self.load_buyers()
@@ -140,10 +469,7 @@ class BuyerManagementDialog(QDialog):
         
         # Company info
         company_label = QLabel(f"Managing buyers for: {self.company_data['name']}")
-        company_font = QFont()
-        company_font.setPointSize(14)
-        company_font.setBold(True)
-        company_label.setFont(company_font)
+        company_label.setFont(self._header_font())
         company_label.setStyleSheet("color: #5aa2ff;")
         header_layout.addWidget(company_label)
         
@@ -172,6 +498,16 @@ class BuyerManagementDialog(QDialog):
         
         layout.addWidget(button_box)
 
+    @classmethod
+    def _header_font(cls):
+        """Return the shared header font"""
+        if cls._HEADER_FONT is None:
+            font = QFont()
+            font.setPointSize(14)
+            font.setBold(True)
+            cls._HEADER_FONT = font
+        return cls._HEADER_FONT
+
     def create_buyer_form(self, parent_layout):
         """Create buyer entry form"""
         form_group = QGroupBox("Add/Edit Buyer")
@@ -192,15 +528,12 @@ class BuyerManagementDialog(QDialog):
         # Row 2: Buyer Type and Province
         form_layout.addWidget(QLabel("Buyer Type*:"), 1, 0)
         self.buyer_type_combo = QComboBox()
-        self.buyer_type_combo.addItems(["Registered", "Unregistered"])
+        self.buyer_type_combo.setModel(_choice_model(_BUYER_TYPES))
         form_layout.addWidget(self.buyer_type_combo, 1, 1)
         
         form_layout.addWidget(QLabel("Province:"), 1, 2)
         self.province_combo = QComboBox()
-        self.province_combo.addItems([
-            "", "Punjab", "Sindh", "Khyber Pakhtunkhwa", "Balochistan",
-            "Gilgit-Baltistan", "Azad Kashmir", "Islamabad Capital Territory"
-        ])
+        self.province_combo.setModel(_choice_model(_PROVINCES))
         form_layout.addWidget(self.province_combo, 1, 3)
         
         # Row 3: City and Phone
@@ -282,90 +615,117 @@ class BuyerManagementDialog(QDialog):
         toolbar_layout.addStretch()
         
         self.refresh_btn = QPushButton("🔄 Refresh")
-        self.refresh_btn.clicked.connect(self.load_buyers)
+        self.refresh_btn.clicked.connect(lambda: self.load_buyers(use_cache=False))
         toolbar_layout.addWidget(self.refresh_btn)
         
-        # Search box
+        # Search box, filtered once typing pauses
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(_FILTER_DELAY_MS)
+        self._filter_timer.timeout.connect(self.filter_buyers)
+        
         self.search_edit = QLineEdit()
         self.search_edit.setPlaceholderText("Search buyers...")
-        self.search_edit.textChanged.connect(self.filter_buyers)
+        self.search_edit.textChanged.connect(lambda _text: self._filter_timer.start())
+        self.search_edit.returnPressed.connect(self._filter_now)
         toolbar_layout.addWidget(self.search_edit)
         
         table_layout.addLayout(toolbar_layout)
         
         # Buyers table
-        self.buyers_table = QTableWidget()
-        self.buyers_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.buyer_model = BuyerTableModel(parent=self)
+        self.buyer_proxy = BuyerFilterProxyModel(self)
+        self.buyer_proxy.setSourceModel(self.buyer_model)
+        self.buyers_table = QTableView()
+        self.buyers_table.setModel(self.buyer_proxy)
+        self.buyer_model.apply_column_widths(self.buyers_table)
+        self.buyers_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
         self.buyers_table.setAlternatingRowColors(True)
+        # Sorting happens in the proxy; start with the query's name order
+        self.buyers_table.setSortingEnabled(True)
+        self.buyers_table.sortByColumn(1, Qt.SortOrder.AscendingOrder)
         self.buyers_table.selectionModel().selectionChanged.connect(self.on_selection_changed)
         table_layout.addWidget(self.buyers_table)
         
         parent_layout.addWidget(table_group)
 
-    def load_buyers(self):
+    def load_buyers(self, use_cache=True):
         """Load buyers for the current company"""
+        cached = _BUYERS_CACHE.get(self.company_id)
+        if use_cache and cached and time.monotonic() - cached[0] < _BUYERS_CACHE_TTL:
+            _, self.buyers, self._ntn_set = cached
+            self.populate_table(self.buyers)
+            return
+        
+        # Query on the thread pool; only the latest request's result is used
+        self._load_token = token = object()
+        self.refresh_btn.setEnabled(False)
+        self._run_worker(
+            DBWorker(self._do_load_buyers),
+            lambda buyers: self._on_buyers_loaded(token, buyers),
+            lambda e: self._on_load_failed(token, e)
+        )
+
+    def _do_load_buyers(self):
+        """Query the buyer listing (runs on a worker thread)"""
+        session = self.db_manager.create_session()
         try:
-            session = self.db_manager.get_session()
-            self.buyers = (
-                session.query(Buyer)
-                .filter_by(company_id=self.company_id)
+            # Only the columns the grid shows; full rows are loaded on edit
+            return (
+                session.query(
+                    Buyer.id, Buyer.name, Buyer.ntn_cnic, Buyer.buyer_type,
+                    Buyer.province, Buyer.phone, Buyer.is_active, Buyer.created_at
+                )
+                .filter(Buyer.company_id == self.company_id)
                 .order_by(Buyer.name.asc())
                 .all()
             )
-            
-            self.populate_table(self.buyers)
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Database Error", f"Failed to load buyers: {str(e)}")
+        finally:
+            session.close()
+
+    def _on_buyers_loaded(self, token, buyers):
+        """Show the buyers fetched by _do_load_buyers"""
+        if token is not self._load_token:
+            return
+        self.refresh_btn.setEnabled(True)
+        
+        self.buyers = buyers
+        self._ntn_set = {buyer.ntn_cnic for buyer in self.buyers if buyer.ntn_cnic}
+        _BUYERS_CACHE[self.company_id] = (time.monotonic(), self.buyers, self._ntn_set)
+        
+        self.populate_table(self.buyers)
+
+    def _on_load_failed(self, token, error):
+        """Report a failed buyer listing query"""
+        if token is not self._load_token:
+            return
+        self.refresh_btn.setEnabled(True)
+        QMessageBox.critical(self, "Database Error", f"Failed to load buyers: {str(error)}")
 
     def populate_table(self, buyers):
         """Populate table with buyers"""
-        self.buyers_table.setRowCount(len(buyers))
-        self.buyers_table.setColumnCount(8)
-        self.buyers_table.setHorizontalHeaderLabels([
-            "ID", "Name", "NTN/CNIC", "Type", "Province", "Phone", "Status", "Created"
-        ])
-        
-        for row, buyer in enumerate(buyers):
-            self.buyers_table.setItem(row, 0, QTableWidgetItem(str(buyer.id)))
-            self.buyers_table.setItem(row, 1, QTableWidgetItem(buyer.name or ""))
-            self.buyers_table.setItem(row, 2, QTableWidgetItem(buyer.ntn_cnic or ""))
-            self.buyers_table.setItem(row, 3, QTableWidgetItem(buyer.buyer_type or ""))
-            self.buyers_table.setItem(row, 4, QTableWidgetItem(buyer.province or ""))
-            self.buyers_table.setItem(row, 5, QTableWidgetItem(buyer.phone or ""))
-            
-            # Status with color coding
-            status_item = QTableWidgetItem("Active" if buyer.is_active else "Inactive")
-            if buyer.is_active:
-                status_item.setBackground(QColor("#28a745"))
-            else:
-                status_item.setBackground(QColor("#dc3545"))
-            self.buyers_table.setItem(row, 6, status_item)
-            
-            self.buyers_table.setItem(row, 7, QTableWidgetItem(
-                buyer.created_at.strftime("%Y-%m-%d") if buyer.created_at else ""
-            ))
-        
-        # Resize columns
-        self.buyers_table.resizeColumnsToContents()
-        header = self.buyers_table.horizontalHeader()
-        header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)  # Name column
+        # Repaint once after the model reset rather than mid-refresh, and keep
+        # the reset from firing on_selection_changed; it runs once afterwards
+        self.buyers_table.setUpdatesEnabled(False)
+        self.buyers_table.blockSignals(True)
+        selection_blocker = QSignalBlocker(self.buyers_table.selectionModel())
+        try:
+            self.buyer_model.set_buyers(buyers)
+        finally:
+            selection_blocker.unblock()
+            self.buyers_table.blockSignals(False)
+            self.buyers_table.setUpdatesEnabled(True)
+        self.on_selection_changed()
+
+    def _filter_now(self):
+        """Apply a pending search immediately"""
+        self._filter_timer.stop()
+        self.filter_buyers()
 
-    def filter_buyers(self, text):
+    def filter_buyers(self):
         """Filter buyers based on search text"""
-        if not text:
-            self.populate_table(self.buyers)
-            return
-        
-        filtered_buyers = [
-            buyer for buyer in self.buyers
-            if text.lower() in (buyer.name or "").lower() or
-               text.lower() in (buyer.ntn_cnic or "").lower() or
-               text.lower() in (buyer.province or "").lower() or
-               text.lower() in (buyer.buyer_type or "").lower()
-        ]
-        
-        self.populate_table(filtered_buyers)
+        self.buyer_proxy.set_filters(self.search_edit.text())
+        self.on_selection_changed()
 
     def save_buyer(self):
         """Save buyer to database with validation"""
@@ -392,7 +752,7 @@ class BuyerManagementDialog(QDialog):
         
         # Validate NTN format for registered buyers
         if buyer_type == "Registered":
-            if not ntn_cnic.isdigit() or len(ntn_cnic) != 13:
+            if not _NTN_RE.match(ntn_cnic):
                 QMessageBox.warning(self, "Validation Error", 
                                   "For registered buyers, NTN/CNIC must be exactly 13 digits!")
                 self.ntn_edit.setFocus()
@@ -400,70 +760,88 @@ class BuyerManagementDialog(QDialog):
         
         # Validate email format if provided
         if email:
-            import re
-            email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-            if not re.match(email_pattern, email):
+            if not _EMAIL_RE.match(email):
                 QMessageBox.warning(self, "Validation Error", "Please enter a valid email address!")
                 self.email_edit.setFocus()
                 return
         
+        # Duplicate NTN check against the already loaded listing
+        if not self.editing_buyer_id and ntn_cnic in self._ntn_set:
+            QMessageBox.warning(self, "Validation Error", 
+                              f"A buyer with NTN/CNIC {ntn_cnic} already exists for this company!")
+            self.ntn_edit.setFocus()
+            return
+        
+        form_data = {
+            'name': name,
+            'ntn_cnic': ntn_cnic,
+            'buyer_type': buyer_type,
+            'province': province or None,
+            'city': city or None,
+            'phone': phone or None,
+            'email': email or None,
+            'address': address or None,
+            'is_active': is_active,
+        }
+        
+        # Commit on the thread pool so a slow database doesn't freeze the UI
+        self.save_buyer_btn.setEnabled(False)
+        self._run_worker(
+            DBWorker(self._do_save_buyer, self.editing_buyer_id, form_data),
+            self._on_buyer_saved,
+            lambda e: self._on_write_failed(e, "Failed to save buyer", self.save_buyer_btn)
+        )
+
+    def _do_save_buyer(self, buyer_id, form_data):
+        """Create or update a buyer (runs on a worker thread)"""
+        session = self.db_manager.create_session()
         try:
-            session = self.db_manager.get_session()
-            
-            if self.editing_buyer_id:
+            if buyer_id:
                 # Edit existing buyer
-                buyer = session.query(Buyer).filter_by(id=self.editing_buyer_id).first()
+                buyer = session.get(Buyer, buyer_id)
                 if not buyer:
-                    QMessageBox.warning(self, "Error", "Buyer not found for editing!")
-                    return
+                    raise ValueError("Buyer not found for editing!")
                     
                 action = "updated"
             else:
-                # Check if buyer with same NTN already exists for this company
-                existing = session.query(Buyer).filter_by(
-                    company_id=self.company_id,
-                    ntn_cnic=ntn_cnic
-                ).first()
-                
-                if existing:
-                    QMessageBox.warning(self, "Validation Error", 
-                                      f"A buyer with NTN/CNIC {ntn_cnic} already exists for this company!")
-                    self.ntn_edit.setFocus()
-                    return
-                
                 # Create new buyer
-                buyer = Buyer(company_id=self.company_id)
+                buyer = Buyer(company_id=self.company_id, created_at=datetime.now())
                 session.add(buyer)
                 action = "created"
             
             # Update buyer fields
-            buyer.name = name
-            buyer.ntn_cnic = ntn_cnic
-            buyer.buyer_type = buyer_type
-            buyer.province = province or None
-            buyer.city = city or None
-            buyer.phone = phone or None
-            buyer.email = email or None
-            buyer.address = address or None
-            buyer.is_active = is_active
+            for field, value in form_data.items():
+                setattr(buyer, field, value)
             buyer.updated_at = datetime.now()
             
-            if not self.editing_buyer_id:
-                buyer.created_at = datetime.now()
-            
+            session.flush()
+            saved = SimpleNamespace(id=buyer.id, created_at=buyer.created_at, **form_data)
             session.commit()
+            return form_data['name'], action, saved
             
-            QMessageBox.information(
-                self, "Success", 
-                f"Buyer '{name}' {action} successfully!"
-            )
-            
-            self.clear_form()
-            self.load_buyers()
-            
-        except Exception as e:
+        except Exception:
             session.rollback()
-            QMessageBox.critical(self, "Database Error", f"Failed to save buyer: {str(e)}")
+            raise
+        finally:
+            session.close()
+
+    def _on_buyer_saved(self, result):
+        """Refresh the dialog after a buyer was saved"""
+        name, action, saved = result
+        self._after_write()
+        if action == "created":
+            self.created_buyers.append(saved)
+        else:
+            self.buyers_changed = True
+        self.save_buyer_btn.setEnabled(True)
+        
+        QMessageBox.information(
+            self, "Success", 
+            f"Buyer '{name}' {action} successfully!"
+        )
+        
+        self.clear_form()
+        self.load_buyers()
 
     def clear_form(self):
         """Clear the form fields"""
@@ -483,22 +861,21 @@ class BuyerManagementDialog(QDialog):
 
     def on_selection_changed(self):
         """Handle table selection changes"""
-        has_selection = len(self.buyers_table.selectedItems()) > 0
+        has_selection = self.buyers_table.selectionModel().hasSelection()
         self.edit_selected_btn.setEnabled(has_selection)
         self.delete_selected_btn.setEnabled(has_selection)
         self.toggle_active_btn.setEnabled(has_selection)
 
     def edit_selected_buyer(self):
         """Edit the selected buyer"""
-        current_row = self.buyers_table.currentRow()
-        if current_row < 0:
+        current = self.buyers_table.currentIndex()
+        if not current.isValid():
             return
             
         try:
-            buyer_id = int(self.buyers_table.item(current_row, 0).text())
+            buyer_id = current.data(Qt.ItemDataRole.UserRole)
             
-            session = self.db_manager.get_session()
-            buyer = session.query(Buyer).filter_by(id=buyer_id).first()
+            buyer = self._session.get(Buyer, buyer_id)
             
             if not buyer:
                 QMessageBox.warning(self, "Error", "Buyer not found!")
@@ -532,13 +909,13 @@ class BuyerManagementDialog(QDialog):
 
     def delete_selected_buyer(self):
         """Delete the selected buyer"""
-        current_row = self.buyers_table.currentRow()
-        if current_row < 0:
+        current = self.buyers_table.currentIndex()
+        if not current.isValid():
             return
             
         try:
-            buyer_id = int(self.buyers_table.item(current_row, 0).text())
-            buyer_name = self.buyers_table.item(current_row, 1).text()
+            buyer_id = current.data(Qt.ItemDataRole.UserRole)
+            buyer_name = current.siblingAtColumn(1).data()
             
             reply = QMessageBox.question(
                 self, "Confirm Delete",
@@ -550,13 +927,16 @@ class BuyerManagementDialog(QDialog):
             )
             
             if reply == QMessageBox.StandardButton.Yes:
-                session = self.db_manager.get_session()
+                session = self._session
                 
                 # Check if buyer is used in any invoices
                 from fbr_core.models import Invoices
-                invoice_count = session.query(Invoices).filter_by(buyer_id=buyer_id).count()
+                has_invoices = session.query(
+                    session.query(Invoices.id).filter_by(buyer_id=buyer_id).exists()
+                ).scalar()
                 
-                if invoice_count > 0:
+                if has_invoices:
+                    invoice_count = session.query(Invoices).filter_by(buyer_id=buyer_id).count()
                     final_reply = QMessageBox.question(
                         self, "Buyer Has Invoices",
                         f"This buyer is associated with {invoice_count} invoice(s).\n\n"
@@ -570,62 +950,137 @@ class BuyerManagementDialog(QDialog):
                     if final_reply != QMessageBox.StandardButton.Yes:
                         return
                 
-                buyer = session.query(Buyer).filter_by(id=buyer_id).first()
-                
-                if buyer:
-                    session.delete(buyer)
-                    session.commit()
-                    
-                    QMessageBox.information(
-                        self, "Success", 
-                        f"Buyer '{buyer_name}' deleted successfully!"
-                    )
-                    
-                    self.load_buyers()
-                    
-                    # Clear form if we were editing this buyer
-                    if self.editing_buyer_id == buyer_id:
-                        self.clear_form()
-                else:
-                    QMessageBox.warning(self, "Error", "Buyer not found!")
+                self.delete_selected_btn.setEnabled(False)
+                self._run_worker(
+                    DBWorker(self._do_delete_buyer, buyer_id),
+                    lambda found: self._on_buyer_deleted(found, buyer_id, buyer_name),
+                    lambda e: self._on_write_failed(e, "Failed to delete buyer", self.delete_selected_btn)
+                )
                     
         except Exception as e:
-            session.rollback()
             QMessageBox.critical(self, "Error", f"Failed to delete buyer: {str(e)}")
 
+    def _do_delete_buyer(self, buyer_id):
+        """Delete a buyer (runs on a worker thread)"""
+        session = self.db_manager.create_session()
+        try:
+            buyer = session.get(Buyer, buyer_id)
+            if not buyer:
+                return False
+            
+            session.delete(buyer)
+            session.commit()
+            return True
+            
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def _on_buyer_deleted(self, found, buyer_id, buyer_name):
+        """Refresh the dialog after a buyer was deleted"""
+        self._after_write()
+        self.buyers_changed = True
+        self.on_selection_changed()
+        
+        if not found:
+            QMessageBox.warning(self, "Error", "Buyer not found!")
+            return
+        
+        QMessageBox.information(
+            self, "Success", 
+            f"Buyer '{buyer_name}' deleted successfully!"
+        )
+        
+        self.load_buyers()
+        
+        # Clear form if we were editing this buyer
+        if self.editing_buyer_id == buyer_id:
+            self.clear_form()
+
     def toggle_buyer_active(self):
         """Toggle active status of selected buyer"""
-        current_row = self.buyers_table.currentRow()
-        if current_row < 0:
+        current = self.buyers_table.currentIndex()
+        if not current.isValid():
             return
             
+        buyer_id = current.data(Qt.ItemDataRole.UserRole)
+        buyer_name = current.siblingAtColumn(1).data()
+        
+        self.toggle_active_btn.setEnabled(False)
+        self._run_worker(
+            DBWorker(self._do_toggle_buyer, buyer_id),
+            lambda new_status: self._on_buyer_toggled(new_status, buyer_id, buyer_name),
+            lambda e: self._on_write_failed(e, "Failed to toggle buyer status", self.toggle_active_btn)
+        )
+
+    def _do_toggle_buyer(self, buyer_id):
+        """Flip a buyer's active flag (runs on a worker thread)
+        
+        Returns the new status, or None if the buyer no longer exists.
+        """
+        session = self.db_manager.create_session()
         try:
-            buyer_id = int(self.buyers_table.item(current_row, 0).text())
-            buyer_name = self.buyers_table.item(current_row, 1).text()
+            buyer = session.get(Buyer, buyer_id)
+            if not buyer:
+                return None
             
-            session = self.db_manager.get_session()
-            buyer = session.query(Buyer).filter_by(id=buyer_id).first()
+            new_status = not buyer.is_active
+            buyer.is_active = new_status
+            buyer.updated_at = datetime.now()
             
-            if buyer:
-                new_status = not buyer.is_active
-                buyer.is_active = new_status
-                buyer.updated_at = datetime.now()
-                
-                session.commit()
-                
-                status_text = "activated" if new_status else "deactivated"
-                QMessageBox.information(
-                    self, "Success", 
-                    f"Buyer '{buyer_name}' {status_text} successfully!"
-                )
-                
-                self.load_buyers()
-            else:
-                QMessageBox.warning(self, "Error", "Buyer not found!")
-                
-        except Exception as e:
+            session.commit()
+            return new_status
+            
+        except Exception:
             session.rollback()
-            QMessageBox.critical(self, "Error", f"Failed to toggle buyer status: {str(e)}")
+            raise
+        finally:
+            session.close()
+
+    def _on_buyer_toggled(self, new_status, buyer_id, buyer_name):
+        """Refresh the dialog after a buyer's status was toggled"""
+        self._after_write()
+        self.buyers_changed = True
+        self.on_selection_changed()
+        
+        if new_status is None:
+            QMessageBox.warning(self, "Error", "Buyer not found!")
+            return
+        
+        # Only the status cell changed, so update that row in place
+        if not self.buyer_model.update_buyer(buyer_id, is_active=new_status):
+            self.load_buyers()
+        
+        status_text = "activated" if new_status else "deactivated"
+        QMessageBox.information(
+            self, "Success", 
+            f"Buyer '{buyer_name}' {status_text} successfully!"
+        )
+
+    def _run_worker(self, worker, on_finished, on_error):
+        """Start a DBWorker, keeping it alive until it reports back"""
+        self._workers.add(worker)
+        worker.signals.finished.connect(lambda result: self._workers.discard(worker))
+        worker.signals.error.connect(lambda e: self._workers.discard(worker))
+        worker.signals.finished.connect(on_finished)
+        worker.signals.error.connect(on_error)
+        worker.start()
+
+    def _after_write(self):
+        """Drop cached buyer data once a worker has committed a change"""
+        _BUYERS_CACHE.pop(self.company_id, None)
+        # The GUI session may still hold the rows the worker just changed
+        self._session.expire_all()
+
+    def _on_write_failed(self, error, message, button):
+        """Report a failed background write"""
+        button.setEnabled(True)
+        if isinstance(error, ValueError):
+            QMessageBox.warning(self, "Validation Error", str(error))
+        else:
+            QMessageBox.critical(self, "Database Error", f"{message}: {str(error)}")
 
 
 class BuyerSelectionDialog(QDialog):
@@ -636,13 +1091,15 @@ class BuyerSelectionDialog(QDialog):
     def __init__(self, db_manager, company_id, parent=None):
         super().__init__(parent)
         self.db_manager = db_manager
+        self._session = db_manager.get_session()
         self.company_id = company_id
         
         self.setWindowTitle("Select Buyer")
         self.setModal(True)
         self.resize(800, 500)
         
-        self.setStyleSheet(parent.styleSheet() if parent else "")
+        self.setObjectName("BuyerSelectionDialog")
+        self.setStyleSheet(_DIALOG_STYLE)
         
         self.setup_ui()
         self.load_buyers()
@@ -655,29 +1112,49 @@ class BuyerSelectionDialog(QDialog):
         search_layout = QHBoxLayout()
         
         search_layout.addWidget(QLabel("Search:"))
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(_FILTER_DELAY_MS)
+        self._filter_timer.timeout.connect(self.filter_buyers)
+        
         self.search_edit = QLineEdit()
         self.search_edit.setPlaceholderText("Type to search buyers...")
-        self.search_edit.textChanged.connect(self.filter_buyers)
+        self.search_edit.textChanged.connect(lambda _text: self._filter_timer.start())
+        self.search_edit.returnPressed.connect(self._filter_now)
         search_layout.addWidget(self.search_edit)
         
         search_layout.addWidget(QLabel("Type:"))
         self.type_filter_combo = QComboBox()
-        self.type_filter_combo.addItems(["All", "Registered", "Unregistered"])
+        self.type_filter_combo.setModel(_choice_model(_TYPE_FILTERS))
         self.type_filter_combo.currentTextChanged.connect(self.filter_buyers)
         search_layout.addWidget(self.type_filter_combo)
         
         search_layout.addWidget(QLabel("Status:"))
         self.status_filter_combo = QComboBox()
-        self.status_filter_combo.addItems(["Active Only", "All", "Inactive Only"])
-        self.status_filter_combo.currentTextChanged.connect(self.filter_buyers)
+        self.status_filter_combo.setModel(_choice_model(_STATUS_FILTERS))
+        self._status_filter = StatusFilter(self.status_filter_combo.currentIndex())
+        # Status is filtered by the query, so a change reloads the rows
+        self.status_filter_combo.currentIndexChanged.connect(self._on_status_filter_changed)
         search_layout.addWidget(self.status_filter_combo)
         
         layout.addLayout(search_layout)
         
         # Buyers table
-        self.buyers_table = QTableWidget()
-        self.buyers_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.buyer_model = BuyerTableModel(
+            columns=BuyerTableModel.COLUMNS[:5] + (("Status", "is_active"),),
+            highlight_status=False,
+            parent=self
+        )
+        self.buyer_proxy = BuyerFilterProxyModel(self)
+        self.buyer_proxy.setSourceModel(self.buyer_model)
+        self.buyers_table = QTableView()
+        self.buyers_table.setModel(self.buyer_proxy)
+        self.buyer_model.apply_column_widths(self.buyers_table)
+        self.buyers_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
         self.buyers_table.setAlternatingRowColors(True)
+        # Sorting happens in the proxy; start with the query's name order
+        self.buyers_table.setSortingEnabled(True)
+        self.buyers_table.sortByColumn(1, Qt.SortOrder.AscendingOrder)
         self.buyers_table.doubleClicked.connect(self.select_buyer)
         layout.addWidget(self.buyers_table)
         
@@ -702,89 +1179,119 @@ class BuyerSelectionDialog(QDialog):
         layout.addLayout(button_layout)
 
     def load_buyers(self):
-        """Load buyers for selection"""
+        """Load the first page of buyers for selection
+        
+        Later pages are fetched as the table is scrolled (see
+        _fetch_buyers_page).
+        """
         try:
-            session = self.db_manager.get_session()
-            self.buyers = (
-                session.query(Buyer)
-                .filter_by(company_id=self.company_id)
-                .order_by(Buyer.name)
-                .all()
-            )
+            self.buyers = self._buyers_page(None)
             
-            self.populate_table(self.buyers)
+            self.populate_table(self.buyers, self._fetch_buyers_page)
+            self.filter_buyers()
             
         except Exception as e:
             QMessageBox.critical(self, "Database Error", f"Failed to load buyers: {str(e)}")
 
-    def populate_table(self, buyers):
-        """Populate table with buyers"""
-        self.buyers_table.setRowCount(len(buyers))
-        self.buyers_table.setColumnCount(6)
-        self.buyers_table.setHorizontalHeaderLabels([
-            "ID", "Name", "NTN/CNIC", "Type", "Province", "Status"
-        ])
-        
-        for row, buyer in enumerate(buyers):
-            self.buyers_table.setItem(row, 0, QTableWidgetItem(str(buyer.id)))
-            self.buyers_table.setItem(row, 1, QTableWidgetItem(buyer.name or ""))
-            self.buyers_table.setItem(row, 2, QTableWidgetItem(buyer.ntn_cnic or ""))
-            self.buyers_table.setItem(row, 3, QTableWidgetItem(buyer.buyer_type or ""))
-            self.buyers_table.setItem(row, 4, QTableWidgetItem(buyer.province or ""))
-            self.buyers_table.setItem(row, 5, QTableWidgetItem(
-                "Active" if buyer.is_active else "Inactive"
+    def _on_status_filter_changed(self, index):
+        """Reload with the newly chosen status filter"""
+        self._status_filter = StatusFilter(index)
+        self.load_buyers()
+
+    def _buyers_page(self, last_buyer):
+        """Query the page of buyers that follows last_buyer (None for the first)
+        
+        Pages are keyed on (name, id) rather than an OFFSET, so each one is an
+        index range scan however deep the user has scrolled.
+        """
+        # Only the columns shown in the table or emitted on selection
+        query = (
+            self._session.query(Buyer)
+            .options(load_only(
+                Buyer.id, Buyer.name, Buyer.ntn_cnic, Buyer.buyer_type,
+                Buyer.province, Buyer.city, Buyer.phone, Buyer.email,
+                Buyer.address, Buyer.is_active
+            ))
+            .filter_by(company_id=self.company_id)
+        )
+        
+        # Let ix_buyers_company_active do the status filtering
+        if self._status_filter != StatusFilter.ALL:
+            query = query.filter(
+                Buyer.is_active.is_(self._status_filter == StatusFilter.ACTIVE)
+            )
+        
+        if last_buyer is not None:
+            query = query.filter(or_(
+                Buyer.name > last_buyer.name,
+                and_(Buyer.name == last_buyer.name, Buyer.id > last_buyer.id)
             ))
         
-        self.buyers_table.resizeColumnsToContents()
+        buyers = (
+            query.order_by(Buyer.name, Buyer.id)
+            .limit(BuyerTableModel.PAGE_SIZE)
+            .all()
+        )
+        
+        # Type and province repeat across most rows; share one string each.
+        # set_committed_value keeps the rows clean in the session.
+        for buyer in buyers:
+            for field in ("buyer_type", "province"):
+                value = getattr(buyer, field)
+                if value:
+                    set_committed_value(buyer, field, sys.intern(value))
+        return buyers
+
+    def _fetch_buyers_page(self, last_buyer):
+        """fetchMore callback for the buyer model"""
+        try:
+            return self._buyers_page(last_buyer)
+        except Exception as e:
+            QMessageBox.critical(self, "Database Error", f"Failed to load buyers: {str(e)}")
+            return []
+
+    def populate_table(self, buyers, fetch_page=None):
+        """Populate table with buyers"""
+        # Repaint once after the model reset rather than mid-refresh
+        self.buyers_table.setUpdatesEnabled(False)
+        self.buyers_table.blockSignals(True)
+        try:
+            self.buyer_model.set_buyers(buyers, fetch_page)
+        finally:
+            self.buyers_table.blockSignals(False)
+            self.buyers_table.setUpdatesEnabled(True)
+
+    def _filter_now(self):
+        """Apply a pending search immediately"""
+        self._filter_timer.stop()
+        self.filter_buyers()
 
     def filter_buyers(self):
-        """Filter buyers based on search text and filters"""
-        search_text = self.search_edit.text().lower()
-        type_filter = self.type_filter_combo.currentText()
-        status_filter = self.status_filter_combo.currentText()
-        
-        filtered_buyers = []
-        
-        for buyer in self.buyers:
-            # Search filter
-            if search_text and not any([
-                search_text in (buyer.name or "").lower(),
-                search_text in (buyer.ntn_cnic or "").lower(),
-                search_text in (buyer.province or "").lower()
-            ]):
-                continue
-            
-            # Type filter
-            if type_filter != "All" and buyer.buyer_type != type_filter:
-                continue
-            
-            # Status filter
-            if status_filter == "Active Only" and not buyer.is_active:
-                continue
-            elif status_filter == "Inactive Only" and buyer.is_active:
-                continue
-            
-            filtered_buyers.append(buyer)
-        
-        self.populate_table(filtered_buyers)
+        """Filter buyers based on search text and type
+
+        Status is already applied by the query in load_buyers.
+        """
+        # Matches may sit on pages not scrolled to yet
+        if self.search_edit.text().strip() or self.type_filter_combo.currentText() != "All":
+            while self.buyer_model.canFetchMore():
+                self.buyer_model.fetchMore()
+        
+        self.buyer_proxy.set_filters(
+            self.search_edit.text(),
+            self.type_filter_combo.currentText()
+        )
 
     def select_buyer(self):
         """Select the current buyer"""
-        current_row = self.buyers_table.currentRow()
-        if current_row < 0:
+        current = self.buyers_table.currentIndex()
+        if not current.isValid():
             QMessageBox.information(self, "Information", "Please select a buyer")
             return
             
         try:
-            buyer_id = int(self.buyers_table.item(current_row, 0).text())
-            buyer_name = self.buyers_table.item(current_row, 1).text()
-            buyer_ntn = self.buyers_table.item(current_row, 2).text()
-            buyer_type = self.buyers_table.item(current_row, 3).text()
-            buyer_province = self.buyers_table.item(current_row, 4).text()
-            
-            # Get full buyer data from database
-            session = self.db_manager.get_session()
-            buyer = session.query(Buyer).filter_by(id=buyer_id).first()
+            # The model already holds the loaded Buyer rows
+            source_row = self.buyer_proxy.mapToSource(current).row()
+            buyer = self.buyer_model.buyer_at(source_row)
             
             if buyer:
                 buyer_data = {
@@ -811,8 +1318,21 @@ class BuyerSelectionDialog(QDialog):
         """Add a new buyer"""
         company_data = {'ntn_cnic': self.company_id, 'name': 'Current Company'}
         dialog = BuyerManagementDialog(self.db_manager, company_data, self)
-        if dialog.exec() == QDialog.DialogCode.Accepted:
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return
+        
+        # Appending to a partly paged list would break its (name, id) keyset
+        if dialog.buyers_changed or self.buyer_model.canFetchMore():
             self.load_buyers()  # Refresh the list
+            return
+        
+        # Only new buyers: add the ones the status filter lets through
+        status = self._status_filter
+        created = [
+            buyer for buyer in dialog.created_buyers
+            if status == StatusFilter.ALL or buyer.is_active == (status == StatusFilter.ACTIVE)
+        ]
+        self.buyer_model.append_buyers(created)
 
 
 # Test the dialogs
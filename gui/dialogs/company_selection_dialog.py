@@ -1,16 +1,103 @@
 # gui/dialogs/company_selection_dialog.py - Fixed Version
 import sys
 from datetime import datetime
+from functools import lru_cache
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QComboBox, QGroupBox, QFormLayout, QLineEdit, QMessageBox,
     QDialogButtonBox, QFrame, QTextEdit, QApplication, QSizePolicy
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal, QDir
 from PyQt6.QtGui import QFont, QPalette, QColor, QPixmap
 from pathlib import Path
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import load_only
 
 from fbr_core.models import Company, FBRSettings
+from gui.workers import DBWorker
+
+
+# Shared by CompanySelectionDialog and (through its parent) AddCompanyDialog
+_DIALOG_STYLE = """
+    QDialog { 
+        background-color: #0f1115; 
+        color: #eaeef6;
+    }
+    QLabel { 
+        color: #eaeef6; 
+        font-size: 13px; 
+    }
+    QGroupBox {
+        background: #1b2028;
+        border: 1px solid #2c3b52;
+        border-radius: 10px;
+        padding: 28px 12px 12px 12px;
+        font-weight: bold;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        subcontrol-position: top left;   /* keep it inside the box */
+        left: 12px;
+        top: 0px;                        /* <-- no negative offset */
+        background: #2c3b52;
+        color: #eaeef6;
+        border-radius: 8px;
+        padding: 2px 10px;
+        font-weight: 600;
+    }
+    QComboBox, QLineEdit, QTextEdit {
+        background: #0f141c;
+        color: #eaeef6;
+        border: 1px solid #334561;
+        border-radius: 6px;
+        padding: 8px 12px;
+        min-height: 34px;
+    }
+    QComboBox:focus, QLineEdit:focus, QTextEdit:focus {
+        border: 1px solid #5aa2ff;
+    }
+    QPushButton {
+        background-color: #5aa2ff; 
+        color: #0f1115; 
+        border: none;
+        padding: 10px 20px; 
+        border-radius: 6px; 
+        font-weight: 700;
+        font-size: 14px;
+    }
+    QPushButton:hover { background:#7bb6ff; }
+    QPushButton:pressed { background:#4b92ec; }
+    QPushButton:disabled { background:#333; color:#666; }
+    QPushButton[style="success"] { background-color: #28a745; }
+    QPushButton[style="success"]:hover { background-color: #218838; }
+    QPushButton[style="warning"] { background-color: #ffc107; color: #000; }
+    QPushButton[style="warning"]:hover { background-color: #e0a800; }
+"""
+
+
+# "icons:" file prefix: the repo's icon folder, then one under the cwd
+_HERE = Path(__file__).resolve()
+QDir.addSearchPath("icons", str(_HERE.parents[2] / "resources" / "icons"))
+QDir.addSearchPath("icons", str(Path.cwd() / "resources" / "icons"))
+
+
+@lru_cache(maxsize=1)
+def _load_logo():
+    """Decode the FBR logo once per process (null pixmap if missing)"""
+    return QPixmap("icons:fbr.jpg")
+
+
+@lru_cache(maxsize=4)
+def _scaled_logo(width, height):
+    """Return the FBR logo scaled to fit width x height (null if missing)"""
+    pix = _load_logo()
+    if pix.isNull():
+        return pix
+    return pix.scaled(
+        width, height,
+        Qt.AspectRatioMode.KeepAspectRatio,
+        Qt.TransformationMode.SmoothTransformation
+    )
 
 
 class CompanySelectionDialog(QDialog):
@@ -23,6 +110,9 @@ class CompanySelectionDialog(QDialog):
         self.db_manager = db_manager
         self.selected_company = None
         
+        # Running DBWorkers, kept alive until they report back
+        self._workers = set()
+        
         self.setWindowTitle("Select Company - FBR E-Invoicing System")
         self.setModal(True)
         self.setFixedSize(700,650)
@@ -31,62 +121,7 @@ class CompanySelectionDialog(QDialog):
         self.setWindowFlags(Qt.WindowType.Dialog | Qt.WindowType.CustomizeWindowHint | 
                           Qt.WindowType.WindowTitleHint | Qt.WindowType.WindowCloseButtonHint)
         
-        self.setStyleSheet("""
-            QDialog { 
-                background-color: #0f1115; 
-                color: #eaeef6;
-            }
-            QLabel { 
-                color: #eaeef6; 
-                font-size: 13px; 
-            }
-            QGroupBox {
-                background: #1b2028;
-                border: 1px solid #2c3b52;
-                border-radius: 10px;
-                padding: 28px 12px 12px 12px;
-                font-weight: bold;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                subcontrol-position: top left;   /* keep it inside the box */
-                left: 12px;
-                top: 0px;                        /* <-- no negative offset */
-                background: #2c3b52;
-                color: #eaeef6;
-                border-radius: 8px;
-                padding: 2px 10px;
-                font-weight: 600;
-            }
-            QComboBox, QLineEdit, QTextEdit {
-                background: #0f141c;
-                color: #eaeef6;
-                border: 1px solid #334561;
-                border-radius: 6px;
-                padding: 8px 12px;
-                min-height: 34px;
-            }
-            QComboBox:focus, QLineEdit:focus, QTextEdit:focus {
-                border: 1px solid #5aa2ff;
-                box-shadow: 0 0 0 2px rgba(90,162,255,0.18);
-            }
-            QPushButton {
-                background-color: #5aa2ff; 
-                color: #0f1115; 
-                border: none;
-                padding: 10px 20px; 
-                border-radius: 6px; 
-                font-weight: 700;
-                font-size: 14px;
-            }
-            QPushButton:hover { background:#7bb6ff; }
-            QPushButton:pressed { background:#4b92ec; }
-            QPushButton:disabled { background:#333; color:#666; }
-            QPushButton[style="success"] { background-color: #28a745; }
-            QPushButton[style="success"]:hover { background-color: #218838; }
-            QPushButton[style="warning"] { background-color: #ffc107; color: #000; }
-            QPushButton[style="warning"]:hover { background-color: #e0a800; }
-        """)
+        self.setStyleSheet(_DIALOG_STYLE)
 
         self.setup_ui()
         self.load_companies()
@@ -109,31 +144,8 @@ class CompanySelectionDialog(QDialog):
         logo_label = QLabel()
         logo_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
-        here = Path(__file__).resolve()
-        candidates = [
-            # resources next to repo root
-            here.parents[2] / "resources" / "icons" / "fbr.jpg",
-            # resources next to the GUI package
-            here.parents[1] / "resources" / "icons" / "fbr.jpg",
-            # common repo names (case sensitive on Linux)
-            here.parents[2] / "FBR-E-Invoicing" / "resources" / "icons" / "fbr.jpg",
-            here.parents[2] / "FBR-E-Invocing" / "resources" / "icons" / "fbr.jpg",
-            # fallback to cwd
-            Path.cwd() / "resources" / "icons" / "fbr.jpg",
-        ]
-
-        pix = QPixmap()
-        for p in candidates:
-            if p.exists():
-                pix = QPixmap(str(p))
-                break
-
-        if not pix.isNull():
-            scaled = pix.scaled(
-                320, 120,
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation
-            )
+        scaled = _scaled_logo(320, 120)
+        if not scaled.isNull():
             logo_label.setPixmap(scaled)
             logo_label.setStyleSheet("margin: 8px 0 14px 0;")
             layout.addWidget(logo_label)
@@ -208,45 +220,79 @@ class CompanySelectionDialog(QDialog):
         layout.addWidget(footer_label)
 
     def load_companies(self):
-        """Load companies from database"""
-        try:
-            session = self.db_manager.get_session()
-            companies = session.query(Company).all()
-            
-            self.company_combo.clear()
-            self.companies_data = {}
-            
-            if not companies:
-                self.company_combo.addItem("No companies found")
-                self.company_combo.setEnabled(False)
-            else:
-                self.company_combo.addItem("-- Select Company --")
-                for company in companies:
-                    display_name = f"{company.name} ({company.ntn_cnic})"
-                    self.company_combo.addItem(display_name)
-                    self.companies_data[display_name] = {
-                        'ntn_cnic': company.ntn_cnic,
-                        'name': company.name,
-                        'address': company.address or "No address specified",
-                        'province': company.province or "Not specified",
-                        'city': company.city or "Not specified",
-                        'business_type': company.business_type or "Not specified",
-                        'phone': company.phone,
-                        'email': company.email,
-                        'contact_person': company.contact_person,
-                        'created_at': company.created_at
-                    }
-                    
-        except Exception as e:
-            QMessageBox.critical(self, "Database Error", 
-                               f"Failed to load companies: {str(e)}")
+        """Load companies from database on the thread pool"""
+        self.company_combo.clear()
+        self.company_combo.addItem("Loading companies...")
+        self.company_combo.setEnabled(False)
+        
+        worker = DBWorker(self._fetch_companies)
+        self._workers.add(worker)
+        worker.signals.finished.connect(lambda result: self._workers.discard(worker))
+        worker.signals.error.connect(lambda e: self._workers.discard(worker))
+        worker.signals.finished.connect(self._on_companies_loaded)
+        worker.signals.error.connect(self._on_companies_failed)
+        worker.start()
+
+    def _fetch_companies(self):
+        """Query the company list (runs on a worker thread)
+        
+        Returns (display name, details) pairs for the combo box.
+        """
+        with self.db_manager.session_scope() as session:
+            # Only the columns the combo items carry; no relationships are touched
+            companies = (
+                session.query(Company)
+                .options(load_only(
+                    Company.ntn_cnic, Company.name, Company.address,
+                    Company.province, Company.city, Company.business_type,
+                    Company.phone, Company.email, Company.contact_person,
+                    Company.created_at
+                ))
+                .all()
+            )
             
+            return [
+                (f"{company.name} ({company.ntn_cnic})", {
+                    'ntn_cnic': company.ntn_cnic,
+                    'name': company.name,
+                    'address': company.address or "No address specified",
+                    'province': company.province or "Not specified",
+                    'city': company.city or "Not specified",
+                    'business_type': company.business_type or "Not specified",
+                    'phone': company.phone,
+                    'email': company.email,
+                    'contact_person': company.contact_person,
+                    'created_at': company.created_at
+                })
+                for company in companies
+            ]
+
+    def _on_companies_loaded(self, companies):
+        """Fill the company combo with the fetched companies"""
+        self.company_combo.clear()
+        
+        if not companies:
+            self.company_combo.addItem("No companies found")
+            return
+        
+        self.company_combo.addItem("-- Select Company --")
+        for display_name, company_data in companies:
+            # Keep the company details on the item itself
+            self.company_combo.addItem(display_name, company_data)
+        self.company_combo.setEnabled(True)
+
+    def _on_companies_failed(self, error):
+        """Report a failed company query"""
+        self.company_combo.clear()
+        self.company_combo.addItem("No companies found")
+        QMessageBox.critical(self, "Database Error", 
+                           f"Failed to load companies: {str(error)}")
+
     def on_company_changed(self):
         """Handle company selection change"""
-        current_text = self.company_combo.currentText()
+        company_data = self.company_combo.currentData()
         
-        if current_text in self.companies_data:
-            company_data = self.companies_data[current_text]
+        if company_data:
             self.selected_company = company_data
             
             # Update details
@@ -287,7 +333,9 @@ class AddCompanyDialog(QDialog):
         self.setModal(True)
         self.setFixedSize(500, 700)
         
-        self.setStyleSheet(parent.styleSheet() if parent else "")
+        # With a parent the sheet cascades from CompanySelectionDialog
+        if parent is None:
+            self.setStyleSheet(_DIALOG_STYLE)
         
         self.setup_ui()
 
@@ -374,44 +422,42 @@ class AddCompanyDialog(QDialog):
             return
 
         try:
-            session = self.db_manager.get_session()
+            with self.db_manager.session_scope() as session:
+                # Check if company already exists
+                existing = session.query(
+                    session.query(Company.ntn_cnic).filter_by(ntn_cnic=ntn).exists()
+                ).scalar()
+                if existing:
+                    self._warn_duplicate_ntn()
+                    return
             
-            # Check if company already exists
-            existing = session.query(Company).filter_by(ntn_cnic=ntn).first()
-            if existing:
-                QMessageBox.warning(self, "Validation Error", 
-                                  "A company with this NTN/CNIC already exists!")
-                self.ntn_edit.setFocus()
-                return
+                # Create new company with all fields
+                new_company = Company(
+                    ntn_cnic=ntn,
+                    name=name,
+                    address=address,
+                    province=province,
+                    registration_date=datetime.utcnow(),
+                    is_active=True
+                )
             
-            # Create new company with all fields
-            new_company = Company(
-                ntn_cnic=ntn,
-                name=name,
-                address=address,
-                province=province,
-                registration_date=datetime.utcnow(),
-                is_active=True
-            )
+                session.add(new_company)
             
-            session.add(new_company)
-            
-            # Create default FBR settings for the company
-            fbr_settings = FBRSettings(
-                company_id=ntn,
-                api_endpoint="https://gw.fbr.gov.pk/di_data/v1/di/postinvoicedata_sb",
-                validation_endpoint="https://gw.fbr.gov.pk/di_data/v1/di/validateinvoicedata_sb",
-                pral_authorization_token="",
-                timeout_seconds=30,
-                max_retries=3,
-                default_mode="sandbox",
-                auto_validate_before_submit=True,
-                auto_queue_on_failure=False,
-                bulk_submission_enabled=False,
-                is_active=True
-            )
-            session.add(fbr_settings)
-            session.commit()
+                # Create default FBR settings for the company
+                fbr_settings = FBRSettings(
+                    company_id=ntn,
+                    api_endpoint="https://gw.fbr.gov.pk/di_data/v1/di/postinvoicedata_sb",
+                    validation_endpoint="https://gw.fbr.gov.pk/di_data/v1/di/validateinvoicedata_sb",
+                    pral_authorization_token="",
+                    timeout_seconds=30,
+                    max_retries=3,
+                    default_mode="sandbox",
+                    auto_validate_before_submit=True,
+                    auto_queue_on_failure=False,
+                    bulk_submission_enabled=False,
+                    is_active=True
+                )
+                session.add(fbr_settings)
             
             QMessageBox.information(self, "Success", 
                                   f"Company '{name}' added successfully!\n\n"
@@ -419,7 +465,15 @@ class AddCompanyDialog(QDialog):
                                   "Make sure to update them in the Settings tab after selecting this company.")
             self.accept()
             
+        except IntegrityError:
+            # NTN/CNIC is the primary key; another save got there first
+            self._warn_duplicate_ntn()
         except Exception as e:
-            session.rollback()
             QMessageBox.critical(self, "Database Error", 
-                               f"Failed to save company: {str(e)}")
\ No newline at end of file
+                               f"Failed to save company: {str(e)}")
+
+    def _warn_duplicate_ntn(self):
+        """Tell the user the NTN/CNIC is already registered"""
+        QMessageBox.warning(self, "Validation Error", 
+                          "A company with this NTN/CNIC already exists!")
+        self.ntn_edit.setFocus()
\ No newline at end of file
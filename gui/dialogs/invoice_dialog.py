@@ -1,16 +1,23 @@
 # gui/dialogs/invoice_dialog.py - Updated Company-Specific Version
+import re
 import sys
+import json
 import requests
+from collections import OrderedDict
 from datetime import datetime, date
+from functools import lru_cache
 from PyQt6.QtWidgets import (
     QApplication, QDialog, QVBoxLayout, QHBoxLayout, QGridLayout,
-    QFormLayout, QWidget, QPushButton, QTableWidget, QTableWidgetItem,
+    QFormLayout, QWidget, QPushButton, QTableView,
     QLabel, QLineEdit, QComboBox, QGroupBox, QDateEdit, QCheckBox,
     QSpinBox, QDoubleSpinBox, QTextEdit, QHeaderView, QMessageBox,
     QDialogButtonBox, QTabWidget, QScrollArea, QSplitter, QProgressBar,
     QFrame
 )
-from PyQt6.QtCore import QDate, Qt, pyqtSignal, QTimer
+from PyQt6.QtCore import (
+    QDate, Qt, pyqtSignal, QTimer, QThread, QAbstractTableModel, QModelIndex, QStringListModel,
+    QSignalBlocker
+)
 from PyQt6.QtGui import QFont, QPalette, QColor
 
 # Import dialogs and services
@@ -19,31 +26,291 @@ from fbr_core.models import Item
 
 # Import the FBR API service
 try:
-    from fbr_core.fbr_api_service import FBRDropdownManager, FBRDateUtils, DropdownDataFormatter
+    from fbr_core.fbr_api_service import (
+        FBRDropdownManager, FBRDateUtils, DropdownDataFormatter, get_http_session,
+        get_cached_dropdown, store_dropdown
+    )
 except ImportError as e:
     print(f"Warning: Could not import FBR API service: {e}")
     # Fallback classes for when API service is not available
-    class FBRDropdownManager:
-        def __init__(self, db_manager): pass
-        def load_dropdown_data(self, *args, **kwargs): pass
-        def format_data_for_dropdown(self, key, data): return []
-        def cleanup_threads(self): pass
+    from fbr_core._fallbacks import (
+        FBRDropdownManager, FBRDateUtils, DropdownDataFormatter, get_http_session,
+        get_cached_dropdown, store_dropdown
+    )
+
+
+# Rate percentage at the end of a rate option, e.g. "3 - 18% along with RS.60 - 18.0%"
+_RATE_RE = re.compile(r'(\d+(?:\.\d+)?)\s*%\s*$')
+
+
+@lru_cache(maxsize=128)
+def _rate_percent(rate_text):
+    """Return the trailing rate percentage of a rate option, 0.0 if none"""
+    match = _RATE_RE.search(rate_text)
+    return float(match.group(1)) if match else 0.0
+
+
+# FBR province IDs by upper-case province name, for the rate lookups
+_PROVINCE_ID_MAP = {
+    'PUNJAB': 7,
+    'SINDH': 8,
+    'KHYBER PAKHTUNKHWA': 9,
+    'BALOCHISTAN': 10,
+    'GILGIT-BALTISTAN': 11,
+    'AZAD KASHMIR': 12,
+    'ISLAMABAD CAPITAL TERRITORY': 13
+}
+
+# Rate options offered when the FBR API service is not available
+_FALLBACK_RATES = ("18%", "17%", "16%", "10%", "5%", "0%")
+
+
+# Dialog stylesheet, built once at import and shared by every instance
+_INVOICE_DIALOG_QSS = """
+QDialog { background-color: #0f1115; }
+QLabel { color: #eaeef6; font-size: 13px; }
+QGroupBox {
+    background: #1b2028;
+    border: 1px solid #2c3b52;
+    border-radius: 10px;
+    padding-top: 18px;
+}
+QGroupBox::title {
+    subcontrol-origin: margin;
+    left: 12px;
+    top: -10px;
+    background: #2c3b52;
+    color: #eaeef6;
+    border-radius: 8px;
+    padding: 2px 10px;
+    font-weight: 600;
+}
+
+/* Inputs: consistent 34px height, clear focus, rounded */
+QLineEdit, QComboBox, QDateEdit, QSpinBox, QDoubleSpinBox {
+    background: #0f141c;
+    color: #eaeef6;
+    border: 1px solid #334561;
+    border-radius: 6px;
+    padding: 6px 10px;
+    min-height: 34px;
+}
+QLineEdit:focus, QComboBox:focus, QDateEdit:focus,
+QSpinBox:focus, QDoubleSpinBox:focus {
+    border: 1px solid #5aa2ff;
+}
+/* Read-only fields carry this object name (no :read-only state matching) */
+QLineEdit#readonlyField {
+    background: #2c3b52;
+    color: #cccccc;
+}
+
+/* Table styling */
+QTableView { background: #0f141c; color:#eaeef6; border: 1px solid #334561; }
+QHeaderView::section {
+    background: #17202b; color: #cfe2ff; border: 1px solid #334561; padding: 6px; font-weight: 600;
+}
+
+/* Buttons */
+QPushButton {
+    background-color: #5aa2ff; color: #0f1115; border: none;
+    padding: 8px 14px; border-radius: 6px; font-weight: 700;
+}
+QPushButton:hover { background:#7bb6ff; }
+QPushButton:pressed { background:#4b92ec; }
+QPushButton:disabled { background:#333; color:#666; }
+QPushButton[style="success"] { background-color: #28a745; color: white; }
+QPushButton[style="warning"] { background-color: #ffc107; color: #000; }
+QPushButton[style="danger"] { background-color: #dc3545; color: white; }
+
+/* Progress bar for loading */
+QProgressBar {
+    border: 2px solid #334561;
+    border-radius: 5px;
+    text-align: center;
+    background: #0f141c;
+    color: #eaeef6;
+}
+QProgressBar::chunk {
+    background-color: #5aa2ff;
+    border-radius: 3px;
+}
+"""
+
+
+class InvoiceItemsModel(QAbstractTableModel):
+    """Table model holding the items added to an invoice
+    
+    Each row is a dict of raw values; cells are only formatted when the view
+    paints them, and the serial number is derived from the row position.
+    Running sums of the amount columns are kept up to date as items are
+    added and removed.
+    """
+    
+    totalsChanged = pyqtSignal(float)  # new invoice total
+    
+    # (header, item key) for each column; "sr" is the 1-based row number
+    COLUMNS = (
+        ("Sr.", "sr"),
+        ("Item Name", "name"),
+        ("HS Code", "hs_code"),
+        ("UoM", "uom"),
+        ("Sale Type", "sale_type"),
+        ("Rate", "rate"),
+        ("Quantity", "quantity"),
+        ("Value Excl. ST", "value_excl_st"),
+        ("Sales Tax", "sales_tax"),
+        ("Extra Tax", "extra_tax"),
+        ("ST Withheld", "st_withheld"),
+        ("Further Tax", "further_tax"),
+        ("Discount", "discount"),
+        ("Total", "total"),
+    )
+    
+    # Keys shown with two decimals
+    AMOUNT_KEYS = frozenset((
+        "value_excl_st", "sales_tax", "extra_tax", "st_withheld",
+        "further_tax", "discount", "total"
+    ))
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._sums = dict.fromkeys(self.AMOUNT_KEYS, 0.0)
+
+    def items(self):
+        """Return the invoice items in display order"""
+        return list(self._rows)
+
+    def total(self):
+        """Return the sum of the items' totals"""
+        return self._sums['total']
+
+    def column_sum(self, key):
+        """Return the sum of one amount column (a key in AMOUNT_KEYS)"""
+        return self._sums[key]
+
+    def _update_sums(self, items, sign=1):
+        """Add (or with sign=-1 subtract) items to the running sums"""
+        if self._rows:
+            sums = self._sums
+            for item in items:
+                for key in self.AMOUNT_KEYS:
+                    sums[key] += sign * item[key]
+        else:
+            # Start from exactly zero again once the list is empty
+            self._sums = dict.fromkeys(self.AMOUNT_KEYS, 0.0)
+        self.totalsChanged.emit(self._sums['total'])
+
+    def append_item(self, item):
+        """Add one item at the end of the list"""
+        row = len(self._rows)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows.append(item)
+        self.endInsertRows()
+        self._update_sums((item,))
+
+    def extend(self, items):
+        """Add several items at once, with a single insert notification"""
+        if not items:
+            return
+        
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(items) - 1)
+        self._rows.extend(items)
+        self.endInsertRows()
+        self._update_sums(items)
+
+    def remove_item(self, row):
+        """Remove the item on the given row"""
+        self.beginRemoveRows(QModelIndex(), row, row)
+        removed = self._rows.pop(row)
+        self.endRemoveRows()
+        self._update_sums((removed,), -1)
+        
+        # Serial numbers below the removed row shift up by one
+        if row < len(self._rows):
+            self.dataChanged.emit(
+                self.index(row, 0), self.index(len(self._rows) - 1, 0),
+                [Qt.ItemDataRole.DisplayRole]
+            )
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.COLUMNS[section][0]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        
+        key = self.COLUMNS[index.column()][1]
+        
+        if role == Qt.ItemDataRole.DisplayRole:
+            if key == "sr":
+                return str(index.row() + 1)
+            value = self._rows[index.row()][key]
+            if key in self.AMOUNT_KEYS:
+                return f"{value:.2f}"
+            return str(value)
+        
+        if role == Qt.ItemDataRole.TextAlignmentRole and (key in self.AMOUNT_KEYS or key == "quantity"):
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        
+        return None
+
+
+# Validation threads whose dialog closed before FBR answered; kept alive
+# here until they finish so Qt does not destroy a running thread
+_ORPHANED_THREADS = set()
+
+
+class InvoiceValidationThread(QThread):
+    """Background thread for the FBR invoice validation call"""
     
-    class FBRDateUtils:
-        @staticmethod
-        def format_date_for_fbr(date_obj): return date_obj.strftime('%d-%b-%Y')
-        @staticmethod 
-        def format_date_iso(date_obj): return date_obj.strftime('%Y-%m-%d')
+    validated = pyqtSignal(dict)  # FBR response body
+    validation_failed = pyqtSignal(str, str, bool)  # title, message, critical
     
-    class DropdownDataFormatter:
-        @staticmethod
-        def extract_hs_code_from_dropdown_text(text): 
-            try: return text.split(' - ')[0].strip()
-            except: return ""
-        @staticmethod
-        def extract_id_from_dropdown_text(text, position=-1):
-            try: return text.split(' - ')[position].strip()  
-            except: return ""
+    def __init__(self, url, invoice_data, headers):
+        super().__init__()
+        self.url = url
+        self.invoice_data = invoice_data
+        self.headers = headers
+    
+    def run(self):
+        """Post the invoice to FBR in background"""
+        try:
+            # Compact body, encoded once here rather than inside requests
+            body = json.dumps(self.invoice_data, separators=(',', ':')).encode('utf-8')
+            
+            # Pooled session: repeat validations reuse the open TLS connection
+            response = get_http_session().post(
+                self.url, data=body, headers=self.headers, timeout=30
+            )
+            
+            if response.status_code == 200:
+                self.validated.emit(response.json())
+            else:
+                self.validation_failed.emit(
+                    "Validation Error",
+                    f"Validation failed: {response.status_code}\n{response.text}",
+                    False
+                )
+                
+        except requests.exceptions.Timeout:
+            self.validation_failed.emit(
+                "Timeout Error", "Request timed out. Please check your connection and try again.", True
+            )
+        except requests.exceptions.RequestException as e:
+            self.validation_failed.emit("Connection Error", f"Failed to connect to FBR API: {str(e)}", True)
+        except Exception as e:
+            self.validation_failed.emit("Validation Error", f"Failed to validate invoice: {str(e)}", True)
 
 
 class FBRInvoiceDialog(QDialog):
@@ -51,6 +318,18 @@ class FBRInvoiceDialog(QDialog):
     
     invoice_saved = pyqtSignal(dict)  # Signal when invoice is saved
     
+    # Rich-text marker appended to required field labels
+    _REQ_SUFFIX = "<span style='color:#1e90ff'>*</span>"
+    
+    # Quiet period before a cascading dropdown change reloads the rates
+    RATES_DEBOUNCE_MS = 150
+    
+    # Rate lists remembered per (date, transaction type, origination)
+    RATE_CACHE_SIZE = 64
+    
+    # Items table column widths, in InvoiceItemsModel.COLUMNS order
+    ITEM_COLUMN_WIDTHS = (50, 220, 90, 60, 110, 80, 80, 110, 90, 90, 90, 90, 80, 110)
+    
     def __init__(self, parent=None, invoice_data=None, mode="sandbox", company_data=None, seller_data=None):
         super().__init__(parent)
         self.invoice_data = invoice_data
@@ -58,6 +337,7 @@ class FBRInvoiceDialog(QDialog):
         self.is_editing = invoice_data is not None
         self.company_data = company_data
         self.seller_data = seller_data or {}
+        self._today = QDate.currentDate()  # default invoice date
         
         # Initialize API service
         self.db_manager = getattr(parent, 'db_manager', None) if parent else None
@@ -65,83 +345,31 @@ class FBRInvoiceDialog(QDialog):
         self.formatter = DropdownDataFormatter()
         
         # Loading state tracking
-        self.loading_dropdowns = set()
+        self._loading_remaining = 0  # dropdowns still waiting for data
+        self._validation_thread = None
+        
+        # (date, transaction type ID, origination ID) of the rates asked for
+        # last, and of the rates the rate combo currently shows
+        self._requested_rate_key = None
+        self._shown_rate_key = None
+        
+        # (item ID, transaction type) the sale type combo was last filled for
+        self._sale_type_key = None
+        self._rate_cache = OrderedDict()  # rate key -> formatted rate items
+        
+        # FBR token, looked up on first use (None until then)
+        self._auth_token = None
+        if hasattr(parent, 'auth_token_edit'):
+            parent.auth_token_edit.textChanged.connect(
+                lambda _: setattr(self, '_auth_token', None)
+            )
         self.dropdown_data_cache = {}
         
         self.setWindowTitle("FBR Invoice Details")
         self.setModal(True)
         self.resize(1400, 900)
         
-        self.setStyleSheet("""
-            QDialog { background-color: #0f1115; }
-            QLabel { color: #eaeef6; font-size: 13px; }
-            QGroupBox {
-                background: #1b2028;
-                border: 1px solid #2c3b52;
-                border-radius: 10px;
-                padding-top: 18px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 12px;
-                top: -10px;
-                background: #2c3b52;
-                color: #eaeef6;
-                border-radius: 8px;
-                padding: 2px 10px;
-                font-weight: 600;
-            }
-
-            /* Inputs: consistent 34px height, clear focus, rounded */
-            QLineEdit, QComboBox, QDateEdit, QSpinBox, QDoubleSpinBox {
-                background: #0f141c;
-                color: #eaeef6;
-                border: 1px solid #334561;
-                border-radius: 6px;
-                padding: 6px 10px;
-                min-height: 34px;
-            }
-            QLineEdit:focus, QComboBox:focus, QDateEdit:focus,
-            QSpinBox:focus, QDoubleSpinBox:focus {
-                border: 1px solid #5aa2ff;
-                box-shadow: 0 0 0 2px rgba(90,162,255,0.18);
-            }
-            QLineEdit:read-only {
-                background: #2c3b52;
-                color: #cccccc;
-            }
-
-            /* Table styling */
-            QTableWidget { background: #0f141c; color:#eaeef6; border: 1px solid #334561; }
-            QHeaderView::section {
-                background: #17202b; color: #cfe2ff; border: 1px solid #334561; padding: 6px; font-weight: 600;
-            }
-
-            /* Buttons */
-            QPushButton {
-                background-color: #5aa2ff; color: #0f1115; border: none;
-                padding: 8px 14px; border-radius: 6px; font-weight: 700;
-            }
-            QPushButton:hover { background:#7bb6ff; }
-            QPushButton:pressed { background:#4b92ec; }
-            QPushButton:disabled { background:#333; color:#666; }
-            QPushButton[style="success"] { background-color: #28a745; color: white; }
-            QPushButton[style="warning"] { background-color: #ffc107; color: #000; }
-            QPushButton[style="danger"] { background-color: #dc3545; color: white; }
-
-            /* Progress bar for loading */
-            QProgressBar {
-                border: 2px solid #334561;
-                border-radius: 5px;
-                text-align: center;
-                background: #0f141c;
-                color: #eaeef6;
-            }
-            QProgressBar::chunk {
-                background-color: #5aa2ff;
-                border-radius: 3px;
-            }
-        """)
+        self.setStyleSheet(_INVOICE_DIALOG_QSS)
 
         self.setup_ui()
         self.setup_signals()
@@ -157,6 +385,16 @@ class FBRInvoiceDialog(QDialog):
 
     def setup_ui(self):
         """Setup the user interface"""
+        # Build every widget with painting frozen, then repaint once
+        self.setUpdatesEnabled(False)
+        try:
+            self._build_ui()
+        finally:
+            self.setUpdatesEnabled(True)
+            self.update()
+
+    def _build_ui(self):
+        """Create the dialog's sections, scroll area and buttons"""
         main_layout = QVBoxLayout(self)
         
         # Create scroll area for the form
@@ -197,10 +435,32 @@ class FBRInvoiceDialog(QDialog):
         header_layout.addWidget(mode_label)
         scroll_layout.addLayout(header_layout)
                 
-        # Create main sections
+        # Create main sections. The items list widgets are built after the
+        # dialog first paints (see _ensure_items_section); its model exists now
+        self.items_model = InvoiceItemsModel(self)
         self.create_seller_buyer_section(scroll_layout)
         self.create_item_selection_section(scroll_layout)
-        self.create_items_list_section(scroll_layout)
+        
+        # Dropdowns filled by populate_dropdowns_from_api
+        self._loading_combos = (
+            self.buyer_province_combo, self.sale_origination_combo,
+            self.destination_supply_combo, self.transaction_type_combo
+        )
+        
+        # All province combos show one shared list instead of four copies
+        self._province_combos = (
+            self.buyer_province_combo, self.sale_origination_combo,
+            self.destination_supply_combo, self.seller_province_combo
+        )
+        self._provinces_model = QStringListModel(self)
+        for combo in self._province_combos:
+            combo.setModel(self._provinces_model)
+        
+        self._items_section = QWidget()
+        items_section_layout = QVBoxLayout(self._items_section)
+        items_section_layout.setContentsMargins(0, 0, 0, 0)
+        scroll_layout.addWidget(self._items_section)
+        self._items_built = False
         
         # Setup scroll area
         scroll_area.setWidget(scroll_widget)
@@ -208,15 +468,25 @@ class FBRInvoiceDialog(QDialog):
         scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
         scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
         
+        # The form paints its own opaque background, so the viewport
+        # behind it does not need to be filled first on every scroll
+        scroll_area.setFrameShape(QFrame.Shape.NoFrame)
+        scroll_area.viewport().setAutoFillBackground(False)
+        form_palette = scroll_widget.palette()
+        form_palette.setColor(QPalette.ColorRole.Window, QColor("#0f1115"))
+        scroll_widget.setPalette(form_palette)
+        scroll_widget.setAutoFillBackground(True)
+        scroll_widget.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent, True)
+        
         main_layout.addWidget(scroll_area)
         
         # Dialog buttons
         button_layout = QHBoxLayout()
         
-        validate_btn = QPushButton("✅ Validate Invoice")
-        validate_btn.setProperty("style", "warning")
-        validate_btn.clicked.connect(self.validate_invoice)
-        button_layout.addWidget(validate_btn)
+        self.validate_btn = QPushButton("✅ Validate Invoice")
+        self.validate_btn.setProperty("style", "warning")
+        self.validate_btn.clicked.connect(self.validate_invoice)
+        button_layout.addWidget(self.validate_btn)
         
         button_layout.addStretch()
         
@@ -234,6 +504,20 @@ class FBRInvoiceDialog(QDialog):
         
         main_layout.addLayout(button_layout)
 
+    @staticmethod
+    def _plain_label(text):
+        """Label that never goes through Qt's rich-text detection"""
+        label = QLabel(text)
+        label.setTextFormat(Qt.TextFormat.PlainText)
+        return label
+
+    @classmethod
+    def _required_label(cls, text):
+        """Rich-text label with the required marker; skips format detection"""
+        label = QLabel(text + cls._REQ_SUFFIX)
+        label.setTextFormat(Qt.TextFormat.RichText)
+        return label
+
     def create_seller_buyer_section(self, parent_layout):
         """Create seller + buyer information section with seller auto-filled"""
         section_group = QGroupBox("Invoice Details")
@@ -242,22 +526,21 @@ class FBRInvoiceDialog(QDialog):
         section_layout.setHorizontalSpacing(18)
         section_layout.setVerticalSpacing(10)
 
-        self._req_lbl = lambda t: f"{t}<span style='color:#1e90ff'>*</span>"
-
         # -------- Row 0: Invoice metadata --------
-        section_layout.addWidget(QLabel(self._req_lbl("Invoice Type")), 0, 0)
+        section_layout.addWidget(self._required_label("Invoice Type"), 0, 0)
         self.invoice_type_combo = QComboBox()
         self.invoice_type_combo.addItems(["Sale Invoice", "Debit Note"])
         section_layout.addWidget(self.invoice_type_combo, 0, 1)
 
-        section_layout.addWidget(QLabel("Invoice No.:"), 0, 2)
+        section_layout.addWidget(self._plain_label("Invoice No.:"), 0, 2)
         self.invoice_no_edit = QLineEdit()
         self.invoice_no_edit.setPlaceholderText("Auto-generated")
         self.invoice_no_edit.setReadOnly(True)
+        self.invoice_no_edit.setObjectName("readonlyField")
         section_layout.addWidget(self.invoice_no_edit, 0, 3)
 
-        section_layout.addWidget(QLabel(self._req_lbl("Invoice Date")), 0, 4)
-        self.invoice_date_edit = QDateEdit(QDate.currentDate())
+        section_layout.addWidget(self._required_label("Invoice Date"), 0, 4)
+        self.invoice_date_edit = QDateEdit(self._today)
         self.invoice_date_edit.setCalendarPopup(True)
         self.invoice_date_edit.setDisplayFormat("d/M/yyyy")
         section_layout.addWidget(self.invoice_date_edit, 0, 5)
@@ -267,24 +550,27 @@ class FBRInvoiceDialog(QDialog):
         seller_label.setStyleSheet("font-weight: bold; color: #5aa2ff; font-size: 14px;")
         section_layout.addWidget(seller_label, 1, 0, 1, 6)
 
-        section_layout.addWidget(QLabel("Seller NTN/CNIC:"), 2, 0)
+        section_layout.addWidget(self._plain_label("Seller NTN/CNIC:"), 2, 0)
         self.seller_reg_no_edit = QLineEdit()
         self.seller_reg_no_edit.setReadOnly(True)
+        self.seller_reg_no_edit.setObjectName("readonlyField")
         section_layout.addWidget(self.seller_reg_no_edit, 2, 1)
 
-        section_layout.addWidget(QLabel("Seller Name:"), 2, 2)
+        section_layout.addWidget(self._plain_label("Seller Name:"), 2, 2)
         self.seller_name_edit = QLineEdit()
         self.seller_name_edit.setReadOnly(True)
+        self.seller_name_edit.setObjectName("readonlyField")
         section_layout.addWidget(self.seller_name_edit, 2, 3, 1, 2)
 
-        section_layout.addWidget(QLabel("Seller Province:"), 3, 0)
+        section_layout.addWidget(self._plain_label("Seller Province:"), 3, 0)
         self.seller_province_combo = QComboBox()
         self.seller_province_combo.setEnabled(False)  # Will be set based on company
         section_layout.addWidget(self.seller_province_combo, 3, 1)
 
-        section_layout.addWidget(QLabel("Seller Address:"), 3, 2)
+        section_layout.addWidget(self._plain_label("Seller Address:"), 3, 2)
         self.seller_address_edit = QLineEdit()
         self.seller_address_edit.setReadOnly(True)
+        self.seller_address_edit.setObjectName("readonlyField")
         section_layout.addWidget(self.seller_address_edit, 3, 3, 1, 2)
 
         # -------- Row 4: BUYER --------
@@ -292,43 +578,43 @@ class FBRInvoiceDialog(QDialog):
         buyer_label.setStyleSheet("font-weight: bold; color: #ffc107; font-size: 14px;")
         section_layout.addWidget(buyer_label, 4, 0, 1, 6)
 
-        section_layout.addWidget(QLabel(self._req_lbl("Buyer Registration No.")), 5, 0)
+        section_layout.addWidget(self._required_label("Buyer Registration No."), 5, 0)
         self.buyer_reg_no_edit = QLineEdit()
         self.buyer_reg_no_edit.setPlaceholderText("Enter buyer NTN/CNIC")
         section_layout.addWidget(self.buyer_reg_no_edit, 5, 1)
 
-        section_layout.addWidget(QLabel(self._req_lbl("Buyer Name")), 5, 2)
+        section_layout.addWidget(self._required_label("Buyer Name"), 5, 2)
         self.buyer_name_edit = QLineEdit()
         self.buyer_name_edit.setPlaceholderText("Enter buyer name")
         section_layout.addWidget(self.buyer_name_edit, 5, 3)
 
-        section_layout.addWidget(QLabel("Buyer Type:"), 5, 4)
+        section_layout.addWidget(self._plain_label("Buyer Type:"), 5, 4)
         self.buyer_type_combo = QComboBox()
         self.buyer_type_combo.addItems(["Registered", "Unregistered"])
         section_layout.addWidget(self.buyer_type_combo, 5, 5)
 
-        section_layout.addWidget(QLabel(self._req_lbl("Buyer Province")), 6, 0)
+        section_layout.addWidget(self._required_label("Buyer Province"), 6, 0)
         self.buyer_province_combo = QComboBox()
         self.buyer_province_combo.setProperty("loading", "true")
         section_layout.addWidget(self.buyer_province_combo, 6, 1)
 
-        section_layout.addWidget(QLabel("Buyer Address:"), 6, 2)
+        section_layout.addWidget(self._plain_label("Buyer Address:"), 6, 2)
         self.buyer_address_edit = QLineEdit()
         self.buyer_address_edit.setPlaceholderText("Street/area, city, district")
         section_layout.addWidget(self.buyer_address_edit, 6, 3, 1, 2)
 
         # -------- Row 7: Transaction details --------
-        section_layout.addWidget(QLabel(self._req_lbl("Transaction Type")), 7, 0)
+        section_layout.addWidget(self._required_label("Transaction Type"), 7, 0)
         self.transaction_type_combo = QComboBox()
         self.transaction_type_combo.setProperty("loading", "true")
         section_layout.addWidget(self.transaction_type_combo, 7, 1)
 
-        section_layout.addWidget(QLabel(self._req_lbl("Sale Origination Province")), 7, 2)
+        section_layout.addWidget(self._required_label("Sale Origination Province"), 7, 2)
         self.sale_origination_combo = QComboBox()
         self.sale_origination_combo.setProperty("loading", "true")
         section_layout.addWidget(self.sale_origination_combo, 7, 3)
 
-        section_layout.addWidget(QLabel(self._req_lbl("Destination of Supply")), 7, 4)
+        section_layout.addWidget(self._required_label("Destination of Supply"), 7, 4)
         self.destination_supply_combo = QComboBox()
         self.destination_supply_combo.setProperty("loading", "true")
         section_layout.addWidget(self.destination_supply_combo, 7, 5)
@@ -341,7 +627,7 @@ class FBRInvoiceDialog(QDialog):
         item_layout = QGridLayout(item_group)
         
         # Row 1: Item selection
-        item_layout.addWidget(QLabel("Select Item*:"), 0, 0)
+        item_layout.addWidget(self._plain_label("Select Item*:"), 0, 0)
         
         select_item_layout = QHBoxLayout()
         self.select_item_btn = QPushButton("🔍 Select from Company Items")
@@ -390,13 +676,13 @@ class FBRInvoiceDialog(QDialog):
         self.sale_type_combo.setProperty("loading", "true")
         item_layout.addWidget(self.sale_type_combo, 2, 1)
         
-        item_layout.addWidget(QLabel("Rate*:"), 2, 2)
+        item_layout.addWidget(self._plain_label("Rate*:"), 2, 2)
         self.rate_combo = QComboBox()
         self.rate_combo.setEditable(True)
         self.rate_combo.setProperty("loading", "true")
         item_layout.addWidget(self.rate_combo, 2, 3)
         
-        item_layout.addWidget(QLabel("Quantity*:"), 2, 4)
+        item_layout.addWidget(self._plain_label("Quantity*:"), 2, 4)
         self.quantity_spin = QDoubleSpinBox()
         self.quantity_spin.setRange(0.001, 999999.999)
         self.quantity_spin.setDecimals(3)
@@ -404,7 +690,7 @@ class FBRInvoiceDialog(QDialog):
         item_layout.addWidget(self.quantity_spin, 2, 5)
         
         # Row 3: Financial fields
-        item_layout.addWidget(QLabel("Value of Sales Excl. ST*:"), 3, 0)
+        item_layout.addWidget(self._plain_label("Value of Sales Excl. ST*:"), 3, 0)
         self.value_excl_st_spin = QDoubleSpinBox()
         self.value_excl_st_spin.setRange(0.00, 99999999.99)
         self.value_excl_st_spin.setDecimals(2)
@@ -415,6 +701,7 @@ class FBRInvoiceDialog(QDialog):
         self.sales_tax_spin.setRange(0.00, 99999999.99)
         self.sales_tax_spin.setDecimals(2)
         self.sales_tax_spin.setReadOnly(True)  # Auto-calculated
+        self.sales_tax_spin.findChild(QLineEdit).setObjectName("readonlyField")
         item_layout.addWidget(self.sales_tax_spin, 3, 3)
         
         item_layout.addWidget(QLabel("Extra Tax:"), 3, 4)
@@ -469,21 +756,21 @@ class FBRInvoiceDialog(QDialog):
         list_layout = QVBoxLayout(list_group)
         
         # Items table
-        self.items_table = QTableWidget(0, 14)
-        self.items_table.setHorizontalHeaderLabels([
-            "Sr.", "Item Name", "HS Code", "UoM", "Sale Type", "Rate", "Quantity",
-            "Value Excl. ST", "Sales Tax", "Extra Tax", "ST Withheld", "Further Tax",
-            "Discount", "Total"
-        ])
-        
-        # Set column widths
+        self.items_table = QTableView()
+        self.items_table.setModel(self.items_model)
+        self.items_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        
+        # Fixed column widths and row height, so the view never has to
+        # measure cell contents to lay itself out
         header = self.items_table.horizontalHeader()
         header.setStretchLastSection(True)
-        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        for col, width in enumerate(self.ITEM_COLUMN_WIDTHS):
+            self.items_table.setColumnWidth(col, width)
         
-        # Set some fixed widths for certain columns
-        self.items_table.setColumnWidth(0, 50)   # Sr.
-        self.items_table.setColumnWidth(6, 80)   # Quantity
+        vertical_header = self.items_table.verticalHeader()
+        vertical_header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical_header.setDefaultSectionSize(24)
         
         # Enable alternating row colors
         self.items_table.setAlternatingRowColors(True)
@@ -525,8 +812,26 @@ class FBRInvoiceDialog(QDialog):
         # Connect table selection changed
         self.items_table.selectionModel().selectionChanged.connect(self.on_item_selection_changed)
         
+        # The model keeps the total; the label just follows it
+        self.items_model.totalsChanged.connect(self.update_totals)
+        
         parent_layout.addWidget(list_group)
 
+    def showEvent(self, event):
+        """Build the deferred items list once the dialog is on screen"""
+        super().showEvent(event)
+        if not self._items_built:
+            QTimer.singleShot(0, self._ensure_items_section)
+
+    def _ensure_items_section(self):
+        """Create the items list section on first need"""
+        if self._items_built:
+            return
+        self._items_built = True
+        self.create_items_list_section(self._items_section.layout())
+        if self.items_model.rowCount():
+            self.update_totals()
+
     def pre_fill_seller_data(self):
         """Pre-fill seller data from company information"""
         if self.company_data and self.seller_data:
@@ -537,9 +842,43 @@ class FBRInvoiceDialog(QDialog):
             # Set seller province when provinces are loaded
             self.seller_province_to_set = self.seller_data.get('sellerProvince', '')
 
+    def load_invoice_data(self):
+        """Fill the form from the invoice being edited"""
+        data = self.invoice_data
+        
+        self.invoice_no_edit.setText(data.get('invoice_number') or "")
+        
+        index = self.invoice_type_combo.findText(data.get('invoiceType') or "")
+        if index >= 0:
+            self.invoice_type_combo.setCurrentIndex(index)
+        
+        if data.get('invoiceDate'):
+            self.invoice_date_edit.setDate(QDate.fromString(data['invoiceDate'], "yyyy-MM-dd"))
+        
+        self.buyer_reg_no_edit.setText(data.get('buyerNTNCNIC') or "")
+        self.buyer_name_edit.setText(data.get('buyerBusinessName') or "")
+        self.buyer_address_edit.setText(data.get('buyerAddress') or "")
+        
+        index = self.buyer_type_combo.findText(data.get('buyerRegistrationType') or "")
+        if index >= 0:
+            self.buyer_type_combo.setCurrentIndex(index)
+        
+        index = self.buyer_province_combo.findText(data.get('buyerProvince') or "")
+        if index >= 0:
+            self.buyer_province_combo.setCurrentIndex(index)
+        
+        # All saved items go in with one insert, not one per row
+        self.items_model.extend(data.get('items') or [])
+
     def setup_signals(self):
         """Setup signal connections for form interactions"""
         
+        # Bursts of cascading changes trigger a single rate reload
+        self._rates_timer = QTimer(self)
+        self._rates_timer.setSingleShot(True)
+        self._rates_timer.setInterval(self.RATES_DEBOUNCE_MS)
+        self._rates_timer.timeout.connect(self._do_load_rates_for_sale_type)
+        
         # Connect dropdown change events for cascading updates
         self.transaction_type_combo.currentTextChanged.connect(self.on_transaction_type_changed)
         self.sale_type_combo.currentTextChanged.connect(self.on_sale_type_changed)
@@ -557,29 +896,40 @@ class FBRInvoiceDialog(QDialog):
             self._populate_fallback_dropdowns()
             return
         
-        # Show loading state
-        self.show_loading_state(True)
-        
         # Track which dropdowns need to be loaded
         dropdowns_to_load = [
             'provinces',
             'transaction_types'
         ]
         
-        self.loading_dropdowns = set(dropdowns_to_load)
+        self._loading_remaining = len(dropdowns_to_load)
         
-        # Load each dropdown
+        # Show loading state
+        self.show_loading_state(True)
+        
+        # Load each dropdown, from the cache when it is fresh enough
         for dropdown_key in dropdowns_to_load:
+            cached = get_cached_dropdown(dropdown_key)
+            if cached is not None:
+                self._apply_dropdown_data(dropdown_key, cached)
+                continue
+            
             self.dropdown_manager.load_dropdown_data(
                 dropdown_key, 
-                callback=self.on_dropdown_data_loaded
+                formatted_callback=self.on_dropdown_data_loaded
             )
 
-    def on_dropdown_data_loaded(self, dropdown_key: str, data: list):
-        """Handle dropdown data loaded from API"""
+    def on_dropdown_data_loaded(self, dropdown_key: str, data: list, formatted_items: list):
+        """Handle dropdown data loaded (and formatted) by the API thread"""
+        store_dropdown(dropdown_key, data)
+        self._apply_dropdown_data(dropdown_key, data, formatted_items)
+
+    def _apply_dropdown_data(self, dropdown_key: str, data: list, formatted_items: list = None):
+        """Fill the matching widgets, formatting raw data if not done yet"""
         try:
             # Format the data for display
-            formatted_items = self.dropdown_manager.format_data_for_dropdown(dropdown_key, data)
+            if formatted_items is None:
+                formatted_items = self.dropdown_manager.format_data_for_dropdown(dropdown_key, data)
             
             # Cache the data
             self.dropdown_data_cache[dropdown_key] = {
@@ -588,48 +938,83 @@ class FBRInvoiceDialog(QDialog):
             }
             
             # Populate the appropriate dropdowns
-            self._populate_dropdown_widgets(dropdown_key, formatted_items)
-            
-            # Remove from loading set
-            self.loading_dropdowns.discard(dropdown_key)
-            
-            # Update loading state
-            if not self.loading_dropdowns:
-                self.show_loading_state(False)
+            self._populate_dropdown_widgets(dropdown_key, formatted_items, data)
                 
         except Exception as e:
             print(f"Error loading dropdown {dropdown_key}: {e}")
-            self.loading_dropdowns.discard(dropdown_key)
-            
-            if not self.loading_dropdowns:
-                self.show_loading_state(False)
+        
+        # Update loading state
+        self._loading_remaining -= 1
+        if self._loading_remaining <= 0:
+            self.show_loading_state(False)
 
-    def _populate_dropdown_widgets(self, dropdown_key: str, items: list):
+    def _populate_dropdown_widgets(self, dropdown_key: str, items: list, data: list = None):
         """Populate specific dropdown widgets with data"""
-        
-        if dropdown_key == 'provinces':
-            self._populate_combo_widget(self.buyer_province_combo, items)
-            self._populate_combo_widget(self.sale_origination_combo, items)
-            self._populate_combo_widget(self.destination_supply_combo, items)
-            
-            # Also populate seller province (read-only)
-            self.seller_province_combo.clear()
-            self.seller_province_combo.addItems(items)
-            if hasattr(self, 'seller_province_to_set'):
-                index = self.seller_province_combo.findText(self.seller_province_to_set)
-                if index >= 0:
-                    self.seller_province_combo.setCurrentIndex(index)
-            
-        elif dropdown_key == 'transaction_types':
-            self._populate_combo_widget(self.transaction_type_combo, items)
+        # The dialog is usually on screen by now; repaint once at the end
+        self.setUpdatesEnabled(False)
+        try:
+            if dropdown_key == 'provinces':
+                self._populate_province_combos(items)
+                
+                # Seller province (read-only) follows the company
+                if hasattr(self, 'seller_province_to_set'):
+                    index = self.seller_province_combo.findText(self.seller_province_to_set)
+                    if index >= 0:
+                        self.seller_province_combo.setCurrentIndex(index)
+                
+            elif dropdown_key == 'transaction_types':
+                # Keep each row's ID so lookups need not parse the text
+                ids = [row.get('transactioN_TYPE_ID') for row in data] if data else None
+                self._populate_combo_widget(self.transaction_type_combo, items, ids)
+        finally:
+            self.setUpdatesEnabled(True)
+            self.update()
 
-    def _populate_combo_widget(self, combo_widget: QComboBox, items: list):
-        """Populate a combo widget with items and remove loading state"""
-        combo_widget.clear()
-        combo_widget.addItems(items)
+    def _populate_combo_widget(self, combo_widget: QComboBox, items: list, ids: list = None):
+        """Populate a combo widget with items and remove loading state
+        
+        ``ids``, when given, are stored as each item's UserRole data.
+        Styling is refreshed by the caller, once for all combos it filled.
+        Listeners see a single change once the new items are in place.
+        """
+        blocker = QSignalBlocker(combo_widget)
+        try:
+            combo_widget.clear()
+            combo_widget.addItems(items)
+            if ids and len(ids) == len(items):
+                for index, item_id in enumerate(ids):
+                    combo_widget.setItemData(index, item_id)
+        finally:
+            blocker.unblock()
         combo_widget.setProperty("loading", "false")
         combo_widget.setEnabled(True)
-        combo_widget.style().polish(combo_widget)  # Refresh styling
+        combo_widget.currentTextChanged.emit(combo_widget.currentText())
+
+    def _populate_province_combos(self, items: list):
+        """Fill the shared province list behind every province combo"""
+        blockers = [QSignalBlocker(combo) for combo in self._province_combos]
+        try:
+            self._provinces_model.setStringList(items)
+            for combo in self._province_combos:
+                if combo.currentIndex() < 0 and items:
+                    combo.setCurrentIndex(0)
+        finally:
+            for blocker in blockers:
+                blocker.unblock()
+        
+        for combo in self._province_combos:
+            if combo is not self.seller_province_combo:
+                combo.setProperty("loading", "false")
+                combo.setEnabled(True)
+            combo.currentTextChanged.emit(combo.currentText())
+
+    @staticmethod
+    def _repolish(widgets):
+        """Re-apply style rules after the widgets' "loading" property changed"""
+        for widget in widgets:
+            style = widget.style()
+            style.unpolish(widget)
+            style.polish(widget)
 
     def show_loading_state(self, is_loading: bool):
         """Show or hide loading state"""
@@ -637,12 +1022,15 @@ class FBRInvoiceDialog(QDialog):
         self.loading_progress.setVisible(is_loading)
         
         if is_loading:
-            self.loading_label.setText(f"Loading dropdown data... ({len(self.loading_dropdowns)} remaining)")
+            self.loading_label.setText(f"Loading dropdown data... ({self._loading_remaining} remaining)")
             self.save_btn.setEnabled(False)
         else:
             self.loading_label.setText("✅ All data loaded")
             self.save_btn.setEnabled(True)
             
+            # One style refresh for every dropdown that finished loading
+            self._repolish(self._loading_combos)
+            
             # Auto-hide after 2 seconds
             QTimer.singleShot(2000, lambda: self.loading_label.setVisible(False))
 
@@ -654,9 +1042,7 @@ class FBRInvoiceDialog(QDialog):
             "Gilgit-Baltistan", "Azad Kashmir", "Islamabad Capital Territory"
         ]
         
-        self.buyer_province_combo.addItems(provinces)
-        self.sale_origination_combo.addItems(provinces)
-        self.destination_supply_combo.addItems(provinces)
+        self._populate_province_combos(provinces)
         
         # Fallback transaction types
         self.transaction_type_combo.addItems(["Goods at standard rate (default)"])
@@ -711,10 +1097,16 @@ class FBRInvoiceDialog(QDialog):
         """Load sale type dropdown based on selected transaction type"""
         transaction_type_text = self.transaction_type_combo.currentText()
         if transaction_type_text and self.selected_item_data:
+            # Already filled for this item and transaction type
+            key = (self.selected_item_data.get('id'), transaction_type_text)
+            if key == self._sale_type_key:
+                return
+            
             # For now, use default sale type
             # In a real implementation, this should query the API based on transaction type
-            self.sale_type_combo.clear()
-            self.sale_type_combo.addItem("Goods at standard rate (default)")
+            self._populate_combo_widget(self.sale_type_combo, ["Goods at standard rate (default)"])
+            self._repolish((self.sale_type_combo,))
+            self._sale_type_key = key
 
     def on_transaction_type_changed(self):
         """Handle transaction type change"""
@@ -730,11 +1122,15 @@ class FBRInvoiceDialog(QDialog):
         self.load_rates_for_sale_type()
 
     def load_rates_for_sale_type(self):
+        """Schedule a rate reload; a burst of changes causes a single load"""
+        self._rates_timer.start()
+
+    def _do_load_rates_for_sale_type(self):
         """Load rate dropdown based on sale type and other parameters"""
         if not self.dropdown_manager:
             # Fallback rates
             self.rate_combo.clear()
-            self.rate_combo.addItems(["18%", "17%", "16%", "10%", "5%", "0%"])
+            self.rate_combo.addItems(_FALLBACK_RATES)
             return
         
         sale_type_text = self.sale_type_combo.currentText()
@@ -745,22 +1141,43 @@ class FBRInvoiceDialog(QDialog):
             return
         
         try:
-            # Extract IDs from dropdown text
-            trans_type_id = self.formatter.extract_id_from_dropdown_text(transaction_type_text, -1)
+            # ID stored with the item; fallback entries only carry it in the text
+            trans_type_id = self.transaction_type_combo.currentData()
+            if trans_type_id is None:
+                trans_type_id = self.formatter.extract_id_from_dropdown_text(transaction_type_text, -1)
             origination_id = self._get_province_id_from_text(origination_text)
             
             if trans_type_id and origination_id:
                 current_date = FBRDateUtils.format_date_for_fbr(self.invoice_date_edit.date())
                 
+                # Nothing to load if the combo already shows these rates; a
+                # request for other rates still in flight is now stale
+                rate_key = (current_date, int(trans_type_id), origination_id)
+                self._requested_rate_key = rate_key
+                if rate_key == self._shown_rate_key:
+                    if not self.rate_combo.isEnabled():
+                        self.rate_combo.setProperty("loading", "false")
+                        self.rate_combo.setEnabled(True)
+                        self._repolish((self.rate_combo,))
+                    return
+                
+                # Rates fetched earlier for the same parameters
+                if rate_key in self._rate_cache:
+                    self._rate_cache.move_to_end(rate_key)
+                    self._show_rates(rate_key, self._rate_cache[rate_key])
+                    return
+                
                 # Show loading state for rate combo
                 self.rate_combo.setProperty("loading", "true")
                 self.rate_combo.setEnabled(False)
-                self.rate_combo.style().polish(self.rate_combo)
+                self._repolish((self.rate_combo,))
                 
                 # Load rate options
                 self.dropdown_manager.load_dropdown_data(
                     'sale_type_rates',
-                    callback=self.on_sale_type_rates_loaded,
+                    formatted_callback=lambda key, data, items: self.on_sale_type_rates_loaded(
+                        key, data, items, rate_key
+                    ),
                     date=current_date,
                     trans_type_id=int(trans_type_id),
                     origination_supplier=origination_id
@@ -769,25 +1186,33 @@ class FBRInvoiceDialog(QDialog):
         except Exception as e:
             print(f"Error loading rates: {e}")
 
-    def on_sale_type_rates_loaded(self, dropdown_key: str, data: list):
+    def on_sale_type_rates_loaded(self, dropdown_key: str, data: list, formatted_items: list,
+                                  rate_key=None):
         """Handle sale type rates data loaded"""
-        if dropdown_key == 'sale_type_rates':
-            formatted_items = self.dropdown_manager.format_data_for_dropdown(dropdown_key, data)
-            self._populate_combo_widget(self.rate_combo, formatted_items)
+        if dropdown_key != 'sale_type_rates':
+            return
+        
+        if rate_key is not None:
+            self._rate_cache[rate_key] = formatted_items
+            self._rate_cache.move_to_end(rate_key)
+            if len(self._rate_cache) > self.RATE_CACHE_SIZE:
+                self._rate_cache.popitem(last=False)
+        
+        # Rates for parameters the user has since changed are stale
+        if rate_key == self._requested_rate_key:
+            self._show_rates(rate_key, formatted_items)
+
+    def _show_rates(self, rate_key, formatted_items: list):
+        """Fill the rate combo with the rates for rate_key"""
+        self._populate_combo_widget(self.rate_combo, formatted_items)
+        self._repolish((self.rate_combo,))
+        self._shown_rate_key = rate_key
 
     def _get_province_id_from_text(self, province_text: str):
         """Get province ID from province text"""
         # This should map to actual province data from API
-        province_map = {
-            'PUNJAB': 7,
-            'SINDH': 8,
-            'KHYBER PAKHTUNKHWA': 9,
-            'BALOCHISTAN': 10,
-            'GILGIT-BALTISTAN': 11,
-            'AZAD KASHMIR': 12,
-            'ISLAMABAD CAPITAL TERRITORY': 13
-        }
-        return province_map.get(province_text.upper(), 8)  # Default to Sindh
+        key = province_text if province_text.isupper() else province_text.upper()
+        return _PROVINCE_ID_MAP.get(key, 8)  # Default to Sindh
 
     def on_date_changed(self):
         """Handle date change - refresh date-dependent dropdowns"""
@@ -799,28 +1224,16 @@ class FBRInvoiceDialog(QDialog):
 
     def calculate_tax(self):
         """Calculate tax based on rate and value"""
-        try:
-            rate_text = self.rate_combo.currentText()
-            if not rate_text:
-                return
-                
-            # Extract rate value from formatted text
-            rate_value = 0.0
-            if '%' in rate_text:
-                # Handle percentage format
-                parts = rate_text.split(' - ')
-                if len(parts) >= 3:
-                    rate_str = parts[2].replace('%', '').strip()
-                else:
-                    rate_str = rate_text.replace('%', '').strip()
-                rate_value = float(rate_str)
-            
-            value_excl_st = self.value_excl_st_spin.value()
-            tax_amount = (value_excl_st * rate_value) / 100
-            self.sales_tax_spin.setValue(tax_amount)
-            
-        except (ValueError, IndexError) as e:
-            print(f"Error calculating tax: {e}")
+        rate_text = self.rate_combo.currentText()
+        if not rate_text:
+            return
+        
+        # Extract rate value from formatted text
+        rate_value = _rate_percent(rate_text)
+        
+        value_excl_st = self.value_excl_st_spin.value()
+        tax_amount = (value_excl_st * rate_value) / 100
+        self.sales_tax_spin.setValue(tax_amount)
 
     def calculate_amounts(self):
         """Calculate amounts based on quantity and value"""
@@ -839,22 +1252,23 @@ class FBRInvoiceDialog(QDialog):
         if not self.selected_item_data:
             QMessageBox.warning(self, "Warning", "Please select an item first!")
             return
+        
+        # Read each field once
+        quantity = self.quantity_spin.value()
+        value_excl_st = self.value_excl_st_spin.value()
             
         # Validate fields
-        if self.quantity_spin.value() <= 0:
+        if quantity <= 0:
             QMessageBox.warning(self, "Validation Error", "Quantity must be greater than 0!")
             return
             
-        if self.value_excl_st_spin.value() <= 0:
+        if value_excl_st <= 0:
             QMessageBox.warning(self, "Validation Error", "Value of Sales must be greater than 0!")
             return
         
-        # Add row to table
-        row = self.items_table.rowCount()
-        self.items_table.insertRow(row)
+        self._ensure_items_section()
         
         # Calculate total for this item
-        value_excl_st = self.value_excl_st_spin.value()
         sales_tax = self.sales_tax_spin.value()
         extra_tax = self.extra_tax_spin.value()
         further_tax = self.further_tax_spin.value()
@@ -862,28 +1276,26 @@ class FBRInvoiceDialog(QDialog):
         
         item_total = value_excl_st + sales_tax + extra_tax + further_tax - discount
         
-        # Populate row data
-        self.items_table.setItem(row, 0, QTableWidgetItem(str(row + 1)))  # Sr.
-        self.items_table.setItem(row, 1, QTableWidgetItem(self.selected_item_data['name']))
-        self.items_table.setItem(row, 2, QTableWidgetItem(self.selected_item_data['hs_code']))
-        self.items_table.setItem(row, 3, QTableWidgetItem(self.selected_item_data['uom']))
-        self.items_table.setItem(row, 4, QTableWidgetItem(self.sale_type_combo.currentText()))
-        self.items_table.setItem(row, 5, QTableWidgetItem(self.rate_combo.currentText()))
-        self.items_table.setItem(row, 6, QTableWidgetItem(str(self.quantity_spin.value())))
-        self.items_table.setItem(row, 7, QTableWidgetItem(f"{value_excl_st:.2f}"))
-        self.items_table.setItem(row, 8, QTableWidgetItem(f"{sales_tax:.2f}"))
-        self.items_table.setItem(row, 9, QTableWidgetItem(f"{extra_tax:.2f}"))
-        self.items_table.setItem(row, 10, QTableWidgetItem(f"{self.st_withheld_spin.value():.2f}"))
-        self.items_table.setItem(row, 11, QTableWidgetItem(f"{further_tax:.2f}"))
-        self.items_table.setItem(row, 12, QTableWidgetItem(f"{discount:.2f}"))
-        self.items_table.setItem(row, 13, QTableWidgetItem(f"{item_total:.2f}"))
-        
-        # Clear form after adding
+        # Amounts are kept to the cent, as shown in the table
+        self.items_model.append_item({
+            'name': self.selected_item_data['name'],
+            'hs_code': self.selected_item_data['hs_code'],
+            'uom': self.selected_item_data['uom'],
+            'sale_type': self.sale_type_combo.currentText(),
+            'rate': self.rate_combo.currentText(),
+            'quantity': quantity,
+            'value_excl_st': round(value_excl_st, 2),
+            'sales_tax': round(sales_tax, 2),
+            'extra_tax': round(extra_tax, 2),
+            'st_withheld': round(self.st_withheld_spin.value(), 2),
+            'further_tax': round(further_tax, 2),
+            'discount': round(discount, 2),
+            'total': round(item_total, 2),
+        })
+        
+        # Clear form after adding (the total label follows the model)
         self.clear_item_fields()
         
-        # Update totals
-        self.update_totals()
-        
         # Show success message
         QMessageBox.information(self, "Success", "Item added to invoice successfully!")
 
@@ -895,6 +1307,8 @@ class FBRInvoiceDialog(QDialog):
         
         self.sale_type_combo.clear()
         self.rate_combo.clear()
+        self._sale_type_key = None
+        self._shown_rate_key = None
         self.quantity_spin.setValue(1.000)
         self.value_excl_st_spin.setValue(0.00)
         self.sales_tax_spin.setValue(0.00)
@@ -905,7 +1319,7 @@ class FBRInvoiceDialog(QDialog):
 
     def edit_selected_item(self):
         """Edit selected item in table"""
-        current_row = self.items_table.currentRow()
+        current_row = self.items_table.currentIndex().row()
         if current_row >= 0:
             # Implementation for editing item
             pass
@@ -914,7 +1328,7 @@ class FBRInvoiceDialog(QDialog):
 
     def delete_selected_item(self):
         """Delete selected item from table"""
-        current_row = self.items_table.currentRow()
+        current_row = self.items_table.currentIndex().row()
         if current_row >= 0:
             reply = QMessageBox.question(
                 self, "Confirm Delete",
@@ -923,33 +1337,20 @@ class FBRInvoiceDialog(QDialog):
             )
             
             if reply == QMessageBox.StandardButton.Yes:
-                self.items_table.removeRow(current_row)
-                self.update_totals()
-                # Update serial numbers
-                for i in range(self.items_table.rowCount()):
-                    self.items_table.setItem(i, 0, QTableWidgetItem(str(i + 1)))
+                # Serial numbers follow the row position, so nothing to renumber
+                self.items_model.remove_item(current_row)
         else:
             QMessageBox.information(self, "Information", "Please select an item to delete")
 
     def on_item_selection_changed(self):
         """Handle item selection changes in table"""
-        has_selection = self.items_table.currentRow() >= 0
+        has_selection = self.items_table.selectionModel().hasSelection()
         self.edit_item_btn.setEnabled(has_selection)
         self.delete_item_btn.setEnabled(has_selection)
 
-    def update_totals(self):
-        """Update total calculations"""
-        total_value = 0.0
-        total_tax = 0.0
-        
-        for row in range(self.items_table.rowCount()):
-            try:
-                item_total = float(self.items_table.item(row, 13).text())
-                total_value += item_total
-            except:
-                continue
-        
-        self.total_label.setText(f"Invoice Total: PKR {total_value:,.2f}")
+    def update_totals(self, *_):
+        """Show the invoice total kept by the items model"""
+        self.total_label.setText(f"Invoice Total: PKR {self.items_model.total():,.2f}")
 
     def validate_invoice(self):
         """Validate invoice using FBR API"""
@@ -965,87 +1366,123 @@ class FBRInvoiceDialog(QDialog):
         try:
             # Build invoice data
             invoice_data = self.get_invoice_data()
-            
-            # Call FBR validation endpoint
-            validation_url = "https://gw.fbr.gov.pk/di_data/v1/di/validateinvoicedata_sb"
-            
-            headers = {
-                'Authorization': f'Bearer {self.get_auth_token()}',
-                'Content-Type': 'application/json'
-            }
-            
-            self.statusBar().showMessage("Validating invoice with FBR...")
-            
-            response = requests.post(validation_url, json=invoice_data, headers=headers, timeout=30)
-            
-            if response.status_code == 200:
-                result = response.json()
-                validation_response = result.get('validationResponse', {})
-                status = validation_response.get('status', 'Unknown')
-                error_msg = validation_response.get('error', '')
-                
-                if status.lower() == 'valid':
-                    QMessageBox.information(
-                        self, "Validation Result", 
-                        "✅ Invoice validation successful!\n\nThe invoice is valid and ready for submission to FBR."
-                    )
-                else:
-                    QMessageBox.warning(
-                        self, "Validation Result", 
-                        f"❌ Invoice validation failed!\n\nStatus: {status}\nError: {error_msg}"
-                    )
-            else:
-                QMessageBox.warning(
-                    self, "Validation Error", 
-                    f"Validation failed: {response.status_code}\n{response.text}"
-                )
-                
-        except requests.exceptions.Timeout:
-            QMessageBox.critical(self, "Timeout Error", "Request timed out. Please check your connection and try again.")
-        except requests.exceptions.RequestException as e:
-            QMessageBox.critical(self, "Connection Error", f"Failed to connect to FBR API: {str(e)}")
         except Exception as e:
             QMessageBox.critical(self, "Validation Error", f"Failed to validate invoice: {str(e)}")
-        finally:
-            if hasattr(self, 'statusBar'):
-                self.statusBar().showMessage("Ready")
+            return
+        
+        # Call FBR validation endpoint
+        validation_url = "https://gw.fbr.gov.pk/di_data/v1/di/validateinvoicedata_sb"
+        
+        headers = {
+            'Authorization': f'Bearer {self.get_auth_token()}',
+            'Content-Type': 'application/json'
+        }
+        
+        # The request runs on a thread; the dialog stays responsive meanwhile
+        self.validate_btn.setEnabled(False)
+        self.loading_label.setText("Validating invoice with FBR...")
+        self.loading_label.setVisible(True)
+        
+        self._validation_thread = InvoiceValidationThread(validation_url, invoice_data, headers)
+        self._validation_thread.validated.connect(self._on_validation_success)
+        self._validation_thread.validation_failed.connect(self._on_validation_failed)
+        self._validation_thread.finished.connect(self._on_validation_finished)
+        self._validation_thread.start()
+
+    def _on_validation_success(self, result: dict):
+        """Show the FBR validation verdict"""
+        validation_response = result.get('validationResponse', {})
+        status = validation_response.get('status', 'Unknown')
+        error_msg = validation_response.get('error', '')
+        
+        if status.lower() == 'valid':
+            QMessageBox.information(
+                self, "Validation Result", 
+                "✅ Invoice validation successful!\n\nThe invoice is valid and ready for submission to FBR."
+            )
+        else:
+            QMessageBox.warning(
+                self, "Validation Result", 
+                f"❌ Invoice validation failed!\n\nStatus: {status}\nError: {error_msg}"
+            )
+
+    def _on_validation_failed(self, title: str, message: str, critical: bool):
+        """Report a validation request that did not get a verdict"""
+        if critical:
+            QMessageBox.critical(self, title, message)
+        else:
+            QMessageBox.warning(self, title, message)
+
+    def _on_validation_finished(self):
+        """Allow another validation once the request is over"""
+        self._validation_thread = None
+        self.validate_btn.setEnabled(True)
+        self.loading_label.setVisible(False)
+
+    def done(self, result):
+        """Detach a validation still in flight before the dialog goes away"""
+        thread = self._validation_thread
+        if thread is not None and thread.isRunning():
+            thread.validated.disconnect()
+            thread.validation_failed.disconnect()
+            thread.finished.disconnect()
+            _ORPHANED_THREADS.add(thread)
+            thread.finished.connect(lambda: _ORPHANED_THREADS.discard(thread))
+        self._validation_thread = None
+        super().done(result)
 
     def get_auth_token(self):
         """Get authentication token for FBR API"""
-        # This should be retrieved from settings or parent window
+        if self._auth_token is None:
+            self._refresh_auth_token()
+        return self._auth_token or ""
+
+    def _refresh_auth_token(self):
+        """Look up the token from the parent window, else the company settings"""
+        token = ""
         if hasattr(self.parent(), 'auth_token_edit'):
-            return self.parent().auth_token_edit.text().strip()
-        return ""
+            token = self.parent().auth_token_edit.text().strip()
+        
+        if not token and self.db_manager and self.company_data:
+            try:
+                session = self.db_manager.get_session()
+                from fbr_core.models import FBRSettings
+                
+                settings = session.query(FBRSettings).filter_by(
+                    company_id=self.company_data['ntn_cnic']
+                ).first()
+                if settings and settings.pral_authorization_token:
+                    token = settings.pral_authorization_token.strip()
+            except Exception as e:
+                print(f"Error getting auth token from database: {e}")
+        
+        self._auth_token = token
 
     def get_invoice_data(self):
         """Get all invoice data from the form"""
         # Collect items from table
         items = []
-        for row in range(self.items_table.rowCount()):
-            try:
-                item = {
-                    "hsCode": self.items_table.item(row, 2).text(),
-                    "productDescription": self.items_table.item(row, 1).text(),
-                    "rate": self.items_table.item(row, 5).text(),
-                    "uoM": self.items_table.item(row, 3).text(),
-                    "quantity": float(self.items_table.item(row, 6).text()),
-                    "totalValues": 0.0,
-                    "valueSalesExcludingST": float(self.items_table.item(row, 7).text()),
-                    "fixedNotifiedValueOrRetailPrice": 0.0,
-                    "salesTaxApplicable": float(self.items_table.item(row, 8).text()),
-                    "salesTaxWithheldAtSource": float(self.items_table.item(row, 10).text()),
-                    "extraTax": float(self.items_table.item(row, 9).text()),
-                    "furtherTax": float(self.items_table.item(row, 11).text()),
-                    "sroScheduleNo": "",
-                    "fedPayable": 0.0,
-                    "discount": float(self.items_table.item(row, 12).text()),
-                    "saleType": self.items_table.item(row, 4).text(),
-                    "sroItemSerialNo": ""
-                }
-                items.append(item)
-            except Exception as e:
-                print(f"Error processing item row {row}: {e}")
-                continue
+        for row in self.items_model.items():
+            item = {
+                "hsCode": row['hs_code'],
+                "productDescription": row['name'],
+                "rate": row['rate'],
+                "uoM": row['uom'],
+                "quantity": row['quantity'],
+                "totalValues": 0.0,
+                "valueSalesExcludingST": row['value_excl_st'],
+                "fixedNotifiedValueOrRetailPrice": 0.0,
+                "salesTaxApplicable": row['sales_tax'],
+                "salesTaxWithheldAtSource": row['st_withheld'],
+                "extraTax": row['extra_tax'],
+                "furtherTax": row['further_tax'],
+                "sroScheduleNo": "",
+                "fedPayable": 0.0,
+                "discount": row['discount'],
+                "saleType": row['sale_type'],
+                "sroItemSerialNo": ""
+            }
+            items.append(item)
         
         # Build main invoice data
         invoice_data = {
@@ -1081,7 +1518,7 @@ class FBRInvoiceDialog(QDialog):
         if not self.buyer_reg_no_edit.text().strip():
             errors.append("Buyer Registration Number is required")
             
-        if self.items_table.rowCount() == 0:
+        if self.items_model.rowCount() == 0:
             errors.append("At least one item is required")
             
         if not self.buyer_province_combo.currentText():
@@ -1133,11 +1570,9 @@ class FBRInvoiceDialog(QDialog):
             # Generate invoice number if not provided
             invoice_number = self.invoice_no_edit.text().strip()
             if not invoice_number:
-                # Generate invoice number based on company and date
-                from datetime import datetime
-                now = datetime.now()
+                # Generate invoice number based on company and save time
                 company_code = self.company_data['ntn_cnic'][-4:]  # Last 4 digits
-                invoice_number = f"INV-{company_code}-{now.strftime('%Y%m%d')}-{now.strftime('%H%M%S')}"
+                invoice_number = f"INV-{company_code}-{datetime.now():%Y%m%d-%H%M%S}"
             
             # Create invoice
             from fbr_core.models import Invoices
@@ -1170,27 +1605,21 @@ class FBRInvoiceDialog(QDialog):
             session.flush()  # Get invoice ID
             
             # Add invoice items
-            total_amount = 0
-            total_tax = 0
-            total_extra_tax = 0
-            total_further_tax = 0
-            total_discount = 0
-            
             from fbr_core.models import SalesInvoiceItem
-            for row in range(self.items_table.rowCount()):
+            for row, row_data in enumerate(self.items_model.items()):
                 try:
-                    item_name = self.items_table.item(row, 1).text()
-                    hs_code = self.items_table.item(row, 2).text()
-                    uom = self.items_table.item(row, 3).text()
-                    sale_type = self.items_table.item(row, 4).text()
-                    rate_text = self.items_table.item(row, 5).text()
-                    quantity = float(self.items_table.item(row, 6).text())
-                    value_excl_st = float(self.items_table.item(row, 7).text())
-                    sales_tax = float(self.items_table.item(row, 8).text())
-                    extra_tax = float(self.items_table.item(row, 9).text())
-                    st_withheld = float(self.items_table.item(row, 10).text())
-                    further_tax = float(self.items_table.item(row, 11).text())
-                    discount = float(self.items_table.item(row, 12).text())
+                    item_name = row_data['name']
+                    hs_code = row_data['hs_code']
+                    uom = row_data['uom']
+                    sale_type = row_data['sale_type']
+                    rate_text = row_data['rate']
+                    quantity = row_data['quantity']
+                    value_excl_st = row_data['value_excl_st']
+                    sales_tax = row_data['sales_tax']
+                    extra_tax = row_data['extra_tax']
+                    st_withheld = row_data['st_withheld']
+                    further_tax = row_data['further_tax']
+                    discount = row_data['discount']
                     
                     # Extract tax rate from rate text
                     tax_rate = 0.0
@@ -1230,24 +1659,21 @@ class FBRInvoiceDialog(QDialog):
                     
                     session.add(invoice_item)
                     
-                    # Update totals
-                    total_amount += value_excl_st
-                    total_tax += sales_tax
-                    total_extra_tax += extra_tax
-                    total_further_tax += further_tax
-                    total_discount += discount
-                    
                 except (ValueError, AttributeError) as e:
                     print(f"Error processing item row {row}: {e}")
                     continue
             
-            # Update invoice totals
-            invoice.subtotal_amount = total_amount
-            invoice.total_tax_amount = total_tax
-            invoice.total_extra_tax = total_extra_tax
-            invoice.total_further_tax = total_further_tax
-            invoice.total_discount = total_discount
-            invoice.grand_total = total_amount + total_tax + total_extra_tax + total_further_tax - total_discount
+            # Update invoice totals from the model's running sums
+            column_sum = self.items_model.column_sum
+            invoice.subtotal_amount = column_sum('value_excl_st')
+            invoice.total_tax_amount = column_sum('sales_tax')
+            invoice.total_extra_tax = column_sum('extra_tax')
+            invoice.total_further_tax = column_sum('further_tax')
+            invoice.total_discount = column_sum('discount')
+            invoice.grand_total = (
+                invoice.subtotal_amount + invoice.total_tax_amount + invoice.total_extra_tax
+                + invoice.total_further_tax - invoice.total_discount
+            )
             
             session.commit()
             
@@ -1269,7 +1695,7 @@ class FBRInvoiceDialog(QDialog):
                 f"Invoice saved successfully!\n\n"
                 f"Invoice Number: {invoice_number}\n"
                 f"Total Amount: PKR {invoice.grand_total:,.2f}\n"
-                f"Items: {self.items_table.rowCount()}\n"
+                f"Items: {self.items_model.rowCount()}\n"
                 f"Mode: {self.mode.title()}"
             )
             
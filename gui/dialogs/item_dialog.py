@@ -4,32 +4,61 @@ import requests
 from datetime import datetime
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QGridLayout, QFormLayout,
-    QLabel, QLineEdit, QComboBox, QTextEdit, QPushButton, QTableWidget,
-    QTableWidgetItem, QGroupBox, QMessageBox, QDialogButtonBox,
+    QLabel, QLineEdit, QComboBox, QTextEdit, QPushButton, QTableView,
+    QGroupBox, QMessageBox, QDialogButtonBox,
     QHeaderView, QFrame, QApplication, QProgressBar
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QThread
+from PyQt6.QtCore import (
+    Qt, pyqtSignal, QTimer, QThread, QAbstractTableModel, QModelIndex, QStringListModel,
+    QSignalBlocker
+)
 from PyQt6.QtGui import QFont
 
 from fbr_core.models import Item
 
 # Import the FBR API service
 try:
-    from fbr_core.fbr_api_service import FBRDropdownManager, DropdownDataFormatter
+    from fbr_core.fbr_api_service import (
+        FBRDropdownManager, DropdownDataFormatter, get_http_session,
+        get_cached_dropdown, store_dropdown
+    )
 except ImportError as e:
     print(f"Warning: Could not import FBR API service: {e}")
     # Fallback classes for when API service is not available
-    class FBRDropdownManager:
-        def __init__(self, db_manager): pass
-        def load_dropdown_data(self, *args, **kwargs): pass
-        def format_data_for_dropdown(self, key, data): return []
-        def cleanup_threads(self): pass
-    
-    class DropdownDataFormatter:
-        @staticmethod
-        def extract_hs_code_from_dropdown_text(text): 
-            try: return text.split(' - ')[0].strip()
-            except: return ""
+    from fbr_core._fallbacks import (
+        FBRDropdownManager, DropdownDataFormatter, get_http_session,
+        get_cached_dropdown, store_dropdown
+    )
+
+
+# Item management stylesheet; kept as one constant so it is built only once
+_DIALOG_STYLE = """
+QDialog { background-color: #0f1115; color: #eaeef6; }
+QLabel { color: #eaeef6; font-size: 13px; }
+QGroupBox { background: #1b2028; border: 1px solid #2c3b52; border-radius: 10px; padding: 28px 12px 12px 12px; font-weight: bold; }
+QGroupBox::title { subcontrol-origin: margin; subcontrol-position: top left; left: 12px; top: 0px; background: #2c3b52; color: #eaeef6; border-radius: 8px; padding: 2px 10px; font-weight: 600; }
+QComboBox, QLineEdit, QTextEdit { background: #0f141c; color: #eaeef6; border: 1px solid #334561; border-radius: 6px; padding: 8px 12px; min-height: 34px; }
+QComboBox:focus, QLineEdit:focus, QTextEdit:focus { border: 1px solid #5aa2ff; }
+QLineEdit:read-only { background: #2c3b52; color: #cccccc; }
+QPushButton { background-color: #5aa2ff; color: #0f1115; border: none; padding: 10px 20px; border-radius: 6px; font-weight: 700; font-size: 14px; }
+QPushButton:hover { background:#7bb6ff; }
+QPushButton:pressed { background:#4b92ec; }
+QPushButton:disabled { background:#333; color:#666; }
+QPushButton[style="success"] { background-color: #28a745; }
+QPushButton[style="success"]:hover { background-color: #218838; }
+QPushButton[style="warning"] { background-color: #ffc107; color: #000; }
+QPushButton[style="warning"]:hover { background-color: #e0a800; }
+QPushButton[style="danger"] { background-color: #dc3545; }
+QPushButton[style="danger"]:hover { background-color: #c82333; }
+QTableView { background: #0f141c; color:#eaeef6; border: 1px solid #334561; }
+QHeaderView::section { background: #17202b; color: #cfe2ff; border: 1px solid #334561; padding: 6px; font-weight: 600; }
+QProgressBar { border: 2px solid #334561; border-radius: 5px; text-align: center; background: #0f141c; color: #eaeef6; }
+QProgressBar::chunk { background-color: #5aa2ff; border-radius: 3px; }
+"""
+
+# UoM description by HS code, shared by every item dialog. Seeded from the
+# company's saved items (the codes it actually uses) and from FBR lookups
+_HS_UOM_CACHE = {}
 
 
 class FBRAPIThread(QThread):
@@ -48,7 +77,9 @@ class FBRAPIThread(QThread):
     def run(self):
         """Execute the API call in background thread"""
         try:
-            response = requests.get(
+            # Shared pooled session: the HS code and UoM calls reuse one
+            # TLS connection to the gateway
+            response = get_http_session().get(
                 self.api_url, 
                 headers=self.headers, 
                 params=self.params,
@@ -72,9 +103,114 @@ class FBRAPIThread(QThread):
             self.error_occurred.emit(self.endpoint_key, f"Unexpected error: {e}")
 
 
+class ItemTableModel(QAbstractTableModel):
+    """Table model exposing a list of company items to a QTableView
+    
+    Rows are the immutable column tuples returned by listing_query, so they
+    stay valid after the shared session commits. Cells are only formatted
+    when the view paints them.
+    """
+    
+    # (header, Item attribute) for each column
+    COLUMNS = (
+        ("ID", "id"),
+        ("Name", "name"),
+        ("HS Code", "hs_code"),
+        ("UoM", "uom"),
+        ("Category", "category"),
+        ("Rate", "standard_rate"),
+        ("Created", "created_at"),
+    )
+    
+    # Fixed column widths in pixels; the Name column stretches instead
+    COLUMN_WIDTHS = {
+        "id": 60,
+        "hs_code": 110,
+        "uom": 140,
+        "category": 110,
+        "standard_rate": 80,
+        "created_at": 130,
+    }
+    
+    ROW_HEIGHT = 30
+    
+    def __init__(self, columns=None, parent=None):
+        super().__init__(parent)
+        self._columns = columns or self.COLUMNS
+        self._rows = []
+
+    @staticmethod
+    def listing_query(session, company_id):
+        """Query for the columns the item tables show, for one company"""
+        return session.query(
+            Item.id, Item.name, Item.hs_code, Item.uom, Item.category,
+            Item.standard_rate, Item.created_at
+        ).filter(Item.company_id == company_id)
+
+    def set_items(self, items):
+        """Replace the displayed items"""
+        self.beginResetModel()
+        self._rows = list(items)
+        self.endResetModel()
+
+    def remove_item(self, row):
+        """Remove the item on the given row"""
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._rows[row]
+        self.endRemoveRows()
+
+    def item_at(self, row):
+        """Return the item shown on the given row"""
+        return self._rows[row]
+
+    def apply_column_widths(self, view):
+        """Give the view fixed section sizes so it never measures cell contents"""
+        header = view.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        for column, (_, field) in enumerate(self._columns):
+            if field == "name":
+                header.setSectionResizeMode(column, QHeaderView.ResizeMode.Stretch)
+            else:
+                header.resizeSection(column, self.COLUMN_WIDTHS[field])
+        
+        rows = view.verticalHeader()
+        rows.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        rows.setDefaultSectionSize(self.ROW_HEIGHT)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self._columns[section][0]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        
+        item = self._rows[index.row()]
+        field = self._columns[index.column()][1]
+        value = getattr(item, field)
+        
+        if field == "id":
+            return str(value)
+        if field == "standard_rate":
+            return f"{value:.2f}" if value else "0.00"
+        if field == "created_at":
+            return value.strftime("%Y-%m-%d %H:%M") if value else ""
+        return value or ""
+
+
 class ItemManagementDialog(QDialog):
     """Dialog for managing company-specific items with FBR API integration"""
     
+    # Quiet period after a keystroke before the HS list is re-filtered
+    HS_SEARCH_DEBOUNCE_MS = 250
+    
     def __init__(self, db_manager, company_id, parent=None):
         super().__init__(parent)
         self.db_manager = db_manager
@@ -90,7 +226,7 @@ class ItemManagementDialog(QDialog):
         self.setModal(True)
         self.resize(1000, 700)
         
-        self.setStyleSheet(""" QDialog { background-color: #0f1115; color: #eaeef6; } QLabel { color: #eaeef6; font-size: 13px; } QGroupBox { background: #1b2028; border: 1px solid #2c3b52; border-radius: 10px; padding: 28px 12px 12px 12px; font-weight: bold; } QGroupBox::title { subcontrol-origin: margin; subcontrol-position: top left; left: 12px; top: 0px; background: #2c3b52; color: #eaeef6; border-radius: 8px; padding: 2px 10px; font-weight: 600; } QComboBox, QLineEdit, QTextEdit { background: #0f141c; color: #eaeef6; border: 1px solid #334561; border-radius: 6px; padding: 8px 12px; min-height: 34px; } QComboBox:focus, QLineEdit:focus, QTextEdit:focus { border: 1px solid #5aa2ff; box-shadow: 0 0 0 2px rgba(90,162,255,0.18); } QLineEdit:read-only { background: #2c3b52; color: #cccccc; } QPushButton { background-color: #5aa2ff; color: #0f1115; border: none; padding: 10px 20px; border-radius: 6px; font-weight: 700; font-size: 14px; } QPushButton:hover { background:#7bb6ff; } QPushButton:pressed { background:#4b92ec; } QPushButton:disabled { background:#333; color:#666; } QPushButton[style="success"] { background-color: #28a745; } QPushButton[style="success"]:hover { background-color: #218838; } QPushButton[style="warning"] { background-color: #ffc107; color: #000; } QPushButton[style="warning"]:hover { background-color: #e0a800; } QPushButton[style="danger"] { background-color: #dc3545; } QPushButton[style="danger"]:hover { background-color: #c82333; } QTableWidget { background: #0f141c; color:#eaeef6; border: 1px solid #334561; } QHeaderView::section { background: #17202b; color: #cfe2ff; border: 1px solid #334561; padding: 6px; font-weight: 600; } QProgressBar { border: 2px solid #334561; border-radius: 5px; text-align: center; background: #0f141c; color: #eaeef6; } QProgressBar::chunk { background-color: #5aa2ff; border-radius: 3px; } """)
+        self.setStyleSheet(_DIALOG_STYLE)
 
         self.setup_ui()
         self.setup_signals()
@@ -154,6 +290,11 @@ class ItemManagementDialog(QDialog):
         form_layout.addWidget(QLabel("HS Code*:"), 0, 0)
         self.hs_code_combo = QComboBox()
         self.hs_code_combo.setEditable(True)
+        # Labels live in one list model, replaced in a single reset; the
+        # HS entries behind the shown rows are kept in _hs_shown
+        self._hs_model = QStringListModel(self)
+        self.hs_code_combo.setModel(self._hs_model)
+        self._hs_shown = []
         self.hs_code_combo.setPlaceholderText("Loading HS codes...")
         self.hs_code_combo.setEnabled(False)
         form_layout.addWidget(self.hs_code_combo, 0, 1)
@@ -248,8 +389,11 @@ class ItemManagementDialog(QDialog):
         table_layout.addLayout(toolbar_layout)
         
         # Items table
-        self.items_table = QTableWidget()
-        self.items_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.items_model = ItemTableModel(parent=self)
+        self.items_table = QTableView()
+        self.items_table.setModel(self.items_model)
+        self.items_model.apply_column_widths(self.items_table)
+        self.items_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
         self.items_table.setAlternatingRowColors(True)
         self.items_table.selectionModel().selectionChanged.connect(self.on_selection_changed)
         table_layout.addWidget(self.items_table)
@@ -260,10 +404,20 @@ class ItemManagementDialog(QDialog):
         # When user selects an item from the list -> fetch UoM
         self.hs_code_combo.currentIndexChanged.connect(self.on_hs_selected)
         # When user types -> filter list (does not fetch UoM)
+        self._hs_search_timer = QTimer(self)
+        self._hs_search_timer.setSingleShot(True)
+        self._hs_search_timer.setInterval(self.HS_SEARCH_DEBOUNCE_MS)
+        self._hs_search_timer.timeout.connect(self._do_hs_search)
         self.hs_code_combo.lineEdit().textEdited.connect(self.on_hs_search_edited)
 
     def load_fbr_dropdown_data(self):
         """Load dropdown data from FBR APIs"""
+        # The HS code list is large and rarely changes; reuse the disk copy
+        cached = get_cached_dropdown('hs_codes')
+        if cached is not None:
+            self.on_hs_codes_loaded('hs_codes', cached)
+            return
+        
         self.show_loading_state(True, "Loading HS codes from FBR...")
         
         # Get authorization token from parent window or settings
@@ -286,7 +440,7 @@ class ItemManagementDialog(QDialog):
             'https://gw.fbr.gov.pk/pdi/v1/itemdesccode',
             headers
         )
-        self.load_hs_codes_thread.data_received.connect(self.on_hs_codes_loaded)
+        self.load_hs_codes_thread.data_received.connect(self._on_hs_codes_fetched)
         self.load_hs_codes_thread.error_occurred.connect(self.on_api_error)
         self.load_hs_codes_thread.start()
 
@@ -315,11 +469,13 @@ class ItemManagementDialog(QDialog):
 
     def on_hs_selected(self, idx: int):
         """Combo selection changed -> get UoM for that HS."""
+        # A picked entry supersedes any filter still waiting to run
+        self._hs_search_timer.stop()
         if idx < 0 or idx >= self.hs_code_combo.count():
             self.uom_edit.clear()
             self.uom_edit.setPlaceholderText("Select an HS Code first")
             return
-        payload = self.hs_code_combo.itemData(idx)
+        payload = self._hs_shown[idx] if idx < len(self._hs_shown) else None
         code = (payload or {}).get("code")
         if not code:
             # fallback: parse from text
@@ -330,6 +486,13 @@ class ItemManagementDialog(QDialog):
 
     def on_uom_request_for(self, hs_code: str):
         """Starts the thread to fetch and set UoM; extracted for reuse."""
+        cached_uom = _HS_UOM_CACHE.get(hs_code)
+        if cached_uom:
+            self.uom_edit.setText(cached_uom)
+            self.uom_edit.setPlaceholderText("Auto-populated from HS code")
+            self.uom_loading_label.setVisible(False)
+            return
+        
         self.uom_edit.clear()
         self.uom_edit.setPlaceholderText("Loading UoM...")
         self.uom_loading_label.setText("🔄 Loading UoM for selected HS code...")
@@ -351,10 +514,17 @@ class ItemManagementDialog(QDialog):
             self.load_uom_thread.quit(); self.load_uom_thread.wait()
 
         self.load_uom_thread = FBRAPIThread('uom', 'https://gw.fbr.gov.pk/pdi/v2/HS_UOM', headers, params)
+        self._uom_hs_code = hs_code
         self.load_uom_thread.data_received.connect(self.on_uom_loaded)
         self.load_uom_thread.error_occurred.connect(self.on_api_error)
         self.load_uom_thread.start()
 
+    def _on_hs_codes_fetched(self, endpoint_key, data):
+        """Keep a fresh HS code list on disk, then show it"""
+        if endpoint_key == 'hs_codes' and data:
+            store_dropdown(endpoint_key, data)
+        self.on_hs_codes_loaded(endpoint_key, data)
+
     def on_hs_codes_loaded(self, endpoint_key, data):
         """Handle HS codes data loaded from API"""
         try:
@@ -366,10 +536,12 @@ class ItemManagementDialog(QDialog):
                     description = (item.get('description') or '').strip()
                     if not hs_code:
                         continue
+                    label = f"{hs_code} - {description}"
                     self._hs_all.append({
                         "code": hs_code,
                         "desc": description,
-                        "label": f"{hs_code} - {description}",
+                        "label": label,
+                        "search": label.lower(),
                     })
 
                 self.hs_code_combo.setEnabled(True)
@@ -414,7 +586,7 @@ class ItemManagementDialog(QDialog):
         for s in fallback_hs_codes:
             code = s.split(" - ")[0].strip()
             desc = s.split(" - ", 1)[1].strip() if " - " in s else ""
-            self._hs_all.append({"code": code, "desc": desc, "label": s})
+            self._hs_all.append({"code": code, "desc": desc, "label": s, "search": s.lower()})
         self.hs_code_combo.setEnabled(True)
         self._rebuild_hs_combo(self._hs_all, preserve_text=False)
         self.hs_code_combo.lineEdit().setPlaceholderText("Type HS code or keyword…")
@@ -427,12 +599,13 @@ class ItemManagementDialog(QDialog):
         typed = self.hs_code_combo.lineEdit().text() if preserve_text else ""
         cursor_pos = self.hs_code_combo.lineEdit().cursorPosition() if preserve_text else 0
 
-        # rebuild without firing signals
-        self.hs_code_combo.blockSignals(True)
-        self.hs_code_combo.clear()
-        for obj in items:
-            self.hs_code_combo.addItem(obj["label"], obj)
-        self.hs_code_combo.blockSignals(False)
+        # rebuild without firing signals, with one model reset
+        blocker = QSignalBlocker(self.hs_code_combo)
+        try:
+            self._hs_shown = items
+            self._hs_model.setStringList([obj["label"] for obj in items])
+        finally:
+            blocker.unblock()
 
         if preserve_text:
             self.hs_code_combo.lineEdit().setText(typed)
@@ -440,19 +613,24 @@ class ItemManagementDialog(QDialog):
 
     def _filter_hs_items(self, query: str) -> list:
         """Digit query -> startswith(code); text query -> contains(label/desc)."""
+        hs_all = self._hs_all
         if not query:
-            return self._hs_all
+            return hs_all
 
         q = query.strip()
         if q.isdigit():
-            return [o for o in self._hs_all if o["code"].startswith(q)]
+            return [o for o in hs_all if o["code"].startswith(q)]
+        # "search" is the lowercased label, which already includes the desc
         ql = q.lower()
-        return [o for o in self._hs_all
-                if (ql in o["label"].lower()) or (ql in (o["desc"] or "").lower())]
+        return [o for o in hs_all if ql in o["search"]]
 
     def on_hs_search_edited(self, text: str):
-        """User typing in the HS box -> filter choices in-place."""
-        filtered = self._filter_hs_items(text)
+        """User typing in the HS box -> filter once typing pauses."""
+        self._hs_search_timer.start()
+
+    def _do_hs_search(self):
+        """Filter choices in-place for the text currently typed."""
+        filtered = self._filter_hs_items(self.hs_code_combo.lineEdit().text())
         self._rebuild_hs_combo(filtered, preserve_text=True)
 
     def on_uom_loaded(self, endpoint_key, data):
@@ -462,6 +640,8 @@ class ItemManagementDialog(QDialog):
                 # Get the first UoM (should be the primary one for this HS code)
                 if len(data) > 0:
                     uom_description = data[0].get('description', '')
+                    if uom_description:
+                        _HS_UOM_CACHE[self._uom_hs_code] = uom_description
                     self.uom_edit.setText(uom_description)
                     self.uom_edit.setPlaceholderText("Auto-populated from HS code")
                     self.uom_loading_label.setText("✅ UoM loaded successfully")
@@ -497,35 +677,17 @@ class ItemManagementDialog(QDialog):
         try:
             session = self.db_manager.get_session()
             items = (
-                session.query(Item)
-                .filter_by(company_id=self.company_id)
+                ItemTableModel.listing_query(session, self.company_id)
                 .order_by(Item.created_at.desc())
                 .all()
             )
             
-            self.items_table.setRowCount(len(items))
-            self.items_table.setColumnCount(7)
-            self.items_table.setHorizontalHeaderLabels([
-                "ID", "Name", "HS Code", "UoM", "Category", "Rate", "Created"
-            ])
-            
-            for row, item in enumerate(items):
-                self.items_table.setItem(row, 0, QTableWidgetItem(str(item.id)))
-                self.items_table.setItem(row, 1, QTableWidgetItem(item.name or ""))
-                self.items_table.setItem(row, 2, QTableWidgetItem(item.hs_code or ""))
-                self.items_table.setItem(row, 3, QTableWidgetItem(item.uom or ""))
-                self.items_table.setItem(row, 4, QTableWidgetItem(item.category or ""))
-                self.items_table.setItem(row, 5, QTableWidgetItem(
-                    f"{item.standard_rate:.2f}" if item.standard_rate else "0.00"
-                ))
-                self.items_table.setItem(row, 6, QTableWidgetItem(
-                    item.created_at.strftime("%Y-%m-%d %H:%M") if item.created_at else ""
-                ))
-            
-            # Resize columns
-            self.items_table.resizeColumnsToContents()
-            header = self.items_table.horizontalHeader()
-            header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)  # Name column
+            self.items_model.set_items(items)
+            
+            # The company's own HS codes are the likeliest to be picked again
+            for item in items:
+                if item.hs_code and item.uom:
+                    _HS_UOM_CACHE.setdefault(item.hs_code, item.uom)
             
         except Exception as e:
             QMessageBox.critical(self, "Database Error", f"Failed to load items: {str(e)}")
@@ -622,18 +784,18 @@ class ItemManagementDialog(QDialog):
 
     def on_selection_changed(self):
         """Handle table selection changes"""
-        has_selection = len(self.items_table.selectedItems()) > 0
+        has_selection = self.items_table.selectionModel().hasSelection()
         self.edit_selected_btn.setEnabled(has_selection)
         self.delete_selected_btn.setEnabled(has_selection)
 
     def edit_selected_item(self):
         """Edit the selected item"""
-        current_row = self.items_table.currentRow()
+        current_row = self.items_table.currentIndex().row()
         if current_row < 0:
             return
             
         try:
-            item_id = int(self.items_table.item(current_row, 0).text())
+            item_id = self.items_model.item_at(current_row).id
             
             session = self.db_manager.get_session()
             item = session.query(Item).filter_by(id=item_id).first()
@@ -680,13 +842,14 @@ class ItemManagementDialog(QDialog):
 
     def delete_selected_item(self):
         """Delete the selected item"""
-        current_row = self.items_table.currentRow()
+        current_row = self.items_table.currentIndex().row()
         if current_row < 0:
             return
             
         try:
-            item_id = int(self.items_table.item(current_row, 0).text())
-            item_name = self.items_table.item(current_row, 1).text()
+            listed = self.items_model.item_at(current_row)
+            item_id = listed.id
+            item_name = listed.name or ""
             
             reply = QMessageBox.question(
                 self, "Confirm Delete",
@@ -709,7 +872,8 @@ class ItemManagementDialog(QDialog):
                         f"Item '{item_name}' deleted successfully!"
                     )
                     
-                    self.load_items()
+                    # Only the deleted row changes; no need to re-query
+                    self.items_model.remove_item(current_row)
                     
                     # Clear form if we were editing this item
                     if self.editing_item_id == item_id:
@@ -769,8 +933,14 @@ class ItemSelectionDialog(QDialog):
         layout.addLayout(search_layout)
         
         # Items table
-        self.items_table = QTableWidget()
-        self.items_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.items_model = ItemTableModel(
+            columns=[c for c in ItemTableModel.COLUMNS if c[1] not in ("category", "created_at")],
+            parent=self
+        )
+        self.items_table = QTableView()
+        self.items_table.setModel(self.items_model)
+        self.items_model.apply_column_widths(self.items_table)
+        self.items_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
         self.items_table.setAlternatingRowColors(True)
         self.items_table.doubleClicked.connect(self.select_item)
         layout.addWidget(self.items_table)
@@ -800,8 +970,7 @@ class ItemSelectionDialog(QDialog):
         try:
             session = self.db_manager.get_session()
             self.items = (
-                session.query(Item)
-                .filter_by(company_id=self.company_id)
+                ItemTableModel.listing_query(session, self.company_id)
                 .order_by(Item.name)
                 .all()
             )
@@ -813,22 +982,7 @@ class ItemSelectionDialog(QDialog):
 
     def populate_table(self, items):
         """Populate table with items"""
-        self.items_table.setRowCount(len(items))
-        self.items_table.setColumnCount(5)
-        self.items_table.setHorizontalHeaderLabels([
-            "ID", "Name", "HS Code", "UoM", "Rate"
-        ])
-        
-        for row, item in enumerate(items):
-            self.items_table.setItem(row, 0, QTableWidgetItem(str(item.id)))
-            self.items_table.setItem(row, 1, QTableWidgetItem(item.name or ""))
-            self.items_table.setItem(row, 2, QTableWidgetItem(item.hs_code or ""))
-            self.items_table.setItem(row, 3, QTableWidgetItem(item.uom or ""))
-            self.items_table.setItem(row, 4, QTableWidgetItem(
-                f"{item.standard_rate:.2f}" if item.standard_rate else "0.00"
-            ))
-        
-        self.items_table.resizeColumnsToContents()
+        self.items_model.set_items(items)
 
     def filter_items(self, text):
         """Filter items based on search text"""
@@ -847,24 +1001,20 @@ class ItemSelectionDialog(QDialog):
 
     def select_item(self):
         """Select the current item"""
-        current_row = self.items_table.currentRow()
+        current_row = self.items_table.currentIndex().row()
         if current_row < 0:
             QMessageBox.information(self, "Information", "Please select an item")
             return
             
         try:
-            item_id = int(self.items_table.item(current_row, 0).text())
-            item_name = self.items_table.item(current_row, 1).text()
-            hs_code = self.items_table.item(current_row, 2).text()
-            uom = self.items_table.item(current_row, 3).text()
-            rate = self.items_table.item(current_row, 4).text()
+            item = self.items_model.item_at(current_row)
             
             item_data = {
-                'id': item_id,
-                'name': item_name,
-                'hs_code': hs_code,
-                'uom': uom,
-                'standard_rate': float(rate) if rate != "0.00" else 0.0
+                'id': item.id,
+                'name': item.name or "",
+                'hs_code': item.hs_code or "",
+                'uom': item.uom or "",
+                'standard_rate': round(item.standard_rate, 2) if item.standard_rate else 0.0
             }
             
             self.item_selected.emit(item_data)
@@ -109,7 +109,6 @@ class FBRSettingsDialog(QDialog):
             }
             QLineEdit:focus, QComboBox:focus, QSpinBox:focus, QTextEdit:focus {
                 border: 1px solid #5aa2ff;
-                box-shadow: 0 0 0 2px rgba(90,162,255,0.18);
             }
             QLineEdit[echoMode="2"] {
                 font-family: monospace;
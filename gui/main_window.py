@@ -12,7 +12,7 @@ from PyQt6.QtWidgets import (
     QSplitter, QScrollArea
 )
 from PyQt6.QtCore import QThread, pyqtSignal, QTimer, QDate, Qt
-from PyQt6.QtGui import QFont, QPixmap, QPalette, QColor
+from PyQt6.QtGui import QFont, QFontMetrics, QPixmap, QPalette, QColor
 
 # Import dialogs
 from gui.dialogs.company_selection_dialog import CompanySelectionDialog
@@ -27,6 +27,21 @@ from fbr_core.models import DatabaseManager, Invoices, FBRQueue, FBRLogs, Item,
 from fbr_core.fbr_service import FBRSubmissionService, FBRQueueManager
 
 
+# Invoices table columns: (header, widest value expected in the column).
+# Widths come from these once, so refreshes never measure cell contents.
+_INVOICE_COLUMNS = (
+    ("ID", "000000"),
+    ("Invoice No", "INV-2025-000000"),
+    ("Buyer Name", ""),  # stretches
+    ("Date", "2025-12-31"),
+    ("Amount", "PKR 99,999,999.00"),
+    ("Status", "Submitted"),
+    ("FBR Status", "Pending"),
+    ("FBR Invoice No", "0000000DI0000000000000"),
+    ("Created", "2025-12-31 23:59"),
+)
+
+
 class FBRProcessingThread(QThread):
     """Background thread for FBR queue processing"""
     
@@ -224,7 +239,6 @@ class MainWindow(QMainWindow):
             }
             QComboBox:focus, QLineEdit:focus, QDateEdit:focus, QSpinBox:focus, QTextEdit:focus {
                 border: 1px solid #5aa2ff;
-                box-shadow: 0 0 0 2px rgba(90,162,255,0.18);
             }
             QCheckBox {
                 color: #eaeef6;
@@ -662,6 +676,19 @@ class MainWindow(QMainWindow):
         self.invoices_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
         self.invoices_table.setAlternatingRowColors(True)
         self.invoices_table.doubleClicked.connect(self.edit_invoice)
+        
+        # Columns are sized once here instead of after every refresh
+        self.invoices_table.setColumnCount(len(_INVOICE_COLUMNS))
+        self.invoices_table.setHorizontalHeaderLabels([title for title, _ in _INVOICE_COLUMNS])
+        header = self.invoices_table.horizontalHeader()
+        header_metrics = QFontMetrics(header.font())
+        cell_metrics = QFontMetrics(self.invoices_table.font())
+        for column, (title, sample) in enumerate(_INVOICE_COLUMNS):
+            width = max(header_metrics.horizontalAdvance(title),
+                        cell_metrics.horizontalAdvance(sample)) + 24
+            self.invoices_table.setColumnWidth(column, max(width, 60))
+        header.setStretchLastSection(False)
+        header.setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)  # Buyer name
         layout.addWidget(self.invoices_table)
 
         return widget
@@ -1055,7 +1082,26 @@ class MainWindow(QMainWindow):
                         'buyerBusinessName': invoice.buyer_name,
                         'buyerAddress': invoice.buyer_address,
                         'buyerProvince': invoice.buyer_province,
-                        'buyerRegistrationType': invoice.buyer_type
+                        'buyerRegistrationType': invoice.buyer_type,
+                        # Rows in the invoice dialog's items model format
+                        'items': [
+                            {
+                                'name': item.item_name,
+                                'hs_code': item.hs_code,
+                                'uom': item.uom,
+                                'sale_type': item.sale_type or "",
+                                'rate': f"{item.tax_rate or 0:g}%",
+                                'quantity': item.quantity,
+                                'value_excl_st': round(item.unit_price * item.quantity, 2),
+                                'sales_tax': item.tax_amount or 0.0,
+                                'extra_tax': item.extra_tax or 0.0,
+                                'st_withheld': item.sales_tax_withheld_at_source or 0.0,
+                                'further_tax': item.further_tax or 0.0,
+                                'discount': item.discount or 0.0,
+                                'total': item.total_value,
+                            }
+                            for item in invoice.invoice_items
+                        ]
                     }
                     
                     seller_data = {
@@ -1313,54 +1359,56 @@ class MainWindow(QMainWindow):
             
             invoices = query.order_by(Invoices.created_at.desc()).limit(200).all()
 
-            self.invoices_table.setRowCount(len(invoices))
-            self.invoices_table.setColumnCount(9)
-            self.invoices_table.setHorizontalHeaderLabels([
-                "ID", "Invoice No", "Buyer Name", "Date", "Amount", 
-                "Status", "FBR Status", "FBR Invoice No", "Created"
-            ])
-
-            for row, invoice in enumerate(invoices):
-                self.invoices_table.setItem(row, 0, QTableWidgetItem(str(invoice.id)))
-                self.invoices_table.setItem(row, 1, QTableWidgetItem(invoice.invoice_number or ""))
-                self.invoices_table.setItem(row, 2, QTableWidgetItem(invoice.buyer_name or ""))
-                self.invoices_table.setItem(row, 3, QTableWidgetItem(
-                    invoice.posting_date.strftime("%Y-%m-%d") if invoice.posting_date else ""
-                ))
-                self.invoices_table.setItem(row, 4, QTableWidgetItem(
-                    f"PKR {invoice.grand_total:,.2f}" if invoice.grand_total else "PKR 0.00"
-                ))
-                
-                # Color code status
-                status_item = QTableWidgetItem(invoice.status or "Draft")
-                if invoice.status == "Completed":
-                    status_item.setBackground(QColor("#28a745"))
-                elif invoice.status == "Failed":
-                    status_item.setBackground(QColor("#dc3545"))
-                elif invoice.status == "Submitted":
-                    status_item.setBackground(QColor("#17a2b8"))
-                else:
-                    status_item.setBackground(QColor("#ffc107"))
-                self.invoices_table.setItem(row, 5, status_item)
-                
-                # Color code FBR status
-                fbr_status_item = QTableWidgetItem(invoice.fbr_status or "Pending")
-                if invoice.fbr_status == "Valid":
-                    fbr_status_item.setBackground(QColor("#28a745"))
-                elif invoice.fbr_status in ["Invalid", "Error"]:
-                    fbr_status_item.setBackground(QColor("#dc3545"))
-                else:
-                    fbr_status_item.setBackground(QColor("#ffc107"))
-                self.invoices_table.setItem(row, 6, fbr_status_item)
-                
-                self.invoices_table.setItem(row, 7, QTableWidgetItem(invoice.fbr_invoice_number or ""))
-                self.invoices_table.setItem(row, 8, QTableWidgetItem(
-                    invoice.created_at.strftime("%Y-%m-%d %H:%M") if invoice.created_at else ""
-                ))
+            table = self.invoices_table
+            status_bg = {
+                "Completed": QColor("#28a745"),
+                "Failed": QColor("#dc3545"),
+                "Submitted": QColor("#17a2b8"),
+            }
+            fbr_status_bg = {
+                "Valid": QColor("#28a745"),
+                "Invalid": QColor("#dc3545"),
+                "Error": QColor("#dc3545"),
+            }
+            pending_bg = QColor("#ffc107")
 
-            self.invoices_table.resizeColumnsToContents()
-            header = self.invoices_table.horizontalHeader()
-            header.setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)  # Buyer name
+            # Fill without sorting, signals or repaints, then lay out once
+            sorting_enabled = table.isSortingEnabled()
+            table.setSortingEnabled(False)
+            table.setUpdatesEnabled(False)
+            table.blockSignals(True)
+            try:
+                table.setRowCount(len(invoices))
+
+                for row, invoice in enumerate(invoices):
+                    table.setItem(row, 0, QTableWidgetItem(str(invoice.id)))
+                    table.setItem(row, 1, QTableWidgetItem(invoice.invoice_number or ""))
+                    table.setItem(row, 2, QTableWidgetItem(invoice.buyer_name or ""))
+                    table.setItem(row, 3, QTableWidgetItem(
+                        invoice.posting_date.strftime("%Y-%m-%d") if invoice.posting_date else ""
+                    ))
+                    table.setItem(row, 4, QTableWidgetItem(
+                        f"PKR {invoice.grand_total:,.2f}" if invoice.grand_total else "PKR 0.00"
+                    ))
+                    
+                    # Color code status
+                    status_item = QTableWidgetItem(invoice.status or "Draft")
+                    status_item.setBackground(status_bg.get(invoice.status, pending_bg))
+                    table.setItem(row, 5, status_item)
+                    
+                    # Color code FBR status
+                    fbr_status_item = QTableWidgetItem(invoice.fbr_status or "Pending")
+                    fbr_status_item.setBackground(fbr_status_bg.get(invoice.fbr_status, pending_bg))
+                    table.setItem(row, 6, fbr_status_item)
+                    
+                    table.setItem(row, 7, QTableWidgetItem(invoice.fbr_invoice_number or ""))
+                    table.setItem(row, 8, QTableWidgetItem(
+                        invoice.created_at.strftime("%Y-%m-%d %H:%M") if invoice.created_at else ""
+                    ))
+            finally:
+                table.blockSignals(False)
+                table.setUpdatesEnabled(True)
+                table.setSortingEnabled(sorting_enabled)
             
         except Exception as e:
             print(f"Error refreshing invoices table: {e}")
@@ -1449,29 +1497,40 @@ class MainWindow(QMainWindow):
             
             buyers = query.order_by(Buyer.name.asc()).all()
 
-            self.buyers_table.setRowCount(len(buyers))
-            self.buyers_table.setColumnCount(7)
-            self.buyers_table.setHorizontalHeaderLabels([
-                "ID", "Name", "NTN/CNIC", "Type", "Province", "Phone", "Status"
-            ])
-
-            for row, buyer in enumerate(buyers):
-                self.buyers_table.setItem(row, 0, QTableWidgetItem(str(buyer.id)))
-                self.buyers_table.setItem(row, 1, QTableWidgetItem(buyer.name or ""))
-                self.buyers_table.setItem(row, 2, QTableWidgetItem(buyer.ntn_cnic or ""))
-                self.buyers_table.setItem(row, 3, QTableWidgetItem(buyer.buyer_type or ""))
-                self.buyers_table.setItem(row, 4, QTableWidgetItem(buyer.province or ""))
-                self.buyers_table.setItem(row, 5, QTableWidgetItem(buyer.phone or ""))
-                
-                status_item = QTableWidgetItem("Active" if buyer.is_active else "Inactive")
-                if buyer.is_active:
-                    status_item.setBackground(QColor("#28a745"))
-                else:
-                    status_item.setBackground(QColor("#dc3545"))
-                self.buyers_table.setItem(row, 6, status_item)
+            table = self.buyers_table
+            active_bg = QColor("#28a745")
+            inactive_bg = QColor("#dc3545")
 
-            self.buyers_table.resizeColumnsToContents()
-            header = self.buyers_table.horizontalHeader()
+            # Fill without sorting, signals or repaints, then lay out once
+            sorting_enabled = table.isSortingEnabled()
+            table.setSortingEnabled(False)
+            table.setUpdatesEnabled(False)
+            table.blockSignals(True)
+            try:
+                table.setRowCount(len(buyers))
+                table.setColumnCount(7)
+                table.setHorizontalHeaderLabels([
+                    "ID", "Name", "NTN/CNIC", "Type", "Province", "Phone", "Status"
+                ])
+
+                for row, buyer in enumerate(buyers):
+                    table.setItem(row, 0, QTableWidgetItem(str(buyer.id)))
+                    table.setItem(row, 1, QTableWidgetItem(buyer.name or ""))
+                    table.setItem(row, 2, QTableWidgetItem(buyer.ntn_cnic or ""))
+                    table.setItem(row, 3, QTableWidgetItem(buyer.buyer_type or ""))
+                    table.setItem(row, 4, QTableWidgetItem(buyer.province or ""))
+                    table.setItem(row, 5, QTableWidgetItem(buyer.phone or ""))
+                    
+                    status_item = QTableWidgetItem("Active" if buyer.is_active else "Inactive")
+                    status_item.setBackground(active_bg if buyer.is_active else inactive_bg)
+                    table.setItem(row, 6, status_item)
+            finally:
+                table.blockSignals(False)
+                table.setUpdatesEnabled(True)
+                table.setSortingEnabled(sorting_enabled)
+
+            table.resizeColumnsToContents()
+            header = table.horizontalHeader()
             header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)  # Name
             
         except Exception as e:
@@ -567,7 +567,6 @@ class FormFieldWidget(QWidget):
             }
             QLineEdit:focus, QComboBox:focus, QTextEdit:focus {
                 border: 1px solid #5aa2ff;
-                box-shadow: 0 0 0 2px rgba(90,162,255,0.18);
             }
         """)
         
@@ -640,7 +639,6 @@ class FormFieldWidget(QWidget):
             }
             QLineEdit:focus, QComboBox:focus, QTextEdit:focus {
                 border: 1px solid #5aa2ff;
-                box-shadow: 0 0 0 2px rgba(90,162,255,0.18);
             }
         """)
         
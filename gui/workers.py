@@ -0,0 +1,41 @@
+# gui/workers.py
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class DBWorkerSignals(QObject):
+    """Signals emitted by DBWorker (QRunnable itself cannot emit signals)"""
+
+    finished = pyqtSignal(object)  # return value of the callable
+    error = pyqtSignal(object)  # exception raised by the callable
+
+
+class DBWorker(QRunnable):
+    """Run a database call on the global thread pool
+
+    The callable runs on a worker thread, so it must use its own session
+    (see DatabaseManager.create_session) rather than the shared GUI one.
+    Results are delivered through ``signals`` on the GUI thread.
+    """
+
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = DBWorkerSignals()
+
+        # The owner keeps a reference until a result arrives
+        self.setAutoDelete(False)
+
+    def run(self):
+        """Execute the callable in the background"""
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.error.emit(e)
+        else:
+            self.signals.finished.emit(result)
+
+    def start(self):
+        """Queue this worker on the global thread pool"""
+        QThreadPool.globalInstance().start(self)
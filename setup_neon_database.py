@@ -549,6 +549,7 @@ Commands:
   python setup_company_database.py reset          - Reset database (WARNING: deletes all data)
   python setup_company_database.py create         - Create a new company interactively
   python setup_company_database.py summary        - Show database summary
+  python setup_company_database.py migrate        - Create missing indexes on an existing database
   python setup_company_database.py help           - Show this help
 
 Features:
@@ -582,6 +583,8 @@ if __name__ == "__main__":
             if test_connection():
                 engine = create_engine(DATABASE_URL)
                 show_database_summary(engine)
+        elif command == "migrate":
+            migrate_data()
         elif command == "help":
             show_help()
         else:
@@ -624,8 +627,17 @@ def backup_company_data(company_id, backup_file=None):
 
 def migrate_data():
     """Migrate data from old structure to company-specific structure"""
-    print("Data migration functionality - implement as needed")
-    # This would handle migrating from older database structures
+    # create_all() skips existing tables, so indexes added to the models
+    # later have to be created explicitly on existing databases
+    try:
+        engine = create_engine(DATABASE_URL)
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(engine, checkfirst=True)
+        print("✅ Database indexes are up to date")
+        
+    except Exception as e:
+        print(f"❌ Migration failed: {str(e)}")
 
 
 def optimize_database():